@@ -1,22 +1,38 @@
 # app/api/v1/endpoints/chat.py
+import asyncio
+import functools
 import uuid
 import logging
 import json
+import mmap
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import unquote
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional, Dict
-from datetime import datetime
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from typing import List, Optional, Dict, Set, Tuple
 
 from app.core.mock_dependencies import get_mock_current_user, get_mock_firestore_db
 from app.core.config import settings
-from app.models.chat import ChatRequest, ChatResponse, ChatMessage, MessageRole, ChatHistory
+from app.models.chat import ChatRequest, ChatResponse, ChatMessage, MessageRole, ChatHistory, utc_now
 from app.models.paper import Paper
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
-# Initialize the appropriate AI service based on configuration
+# Prefer orjson for chat history I/O, fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not installed. Chat history will use stdlib json.")
+
+# Services are created lazily on first use so importing this module stays cheap
+@functools.lru_cache(maxsize=1)
 def get_vertex_ai_service():
     """Get the appropriate Vertex AI service based on API key availability"""
     if settings.vertex_ai_api_key:
@@ -31,29 +47,55 @@ def get_vertex_ai_service():
     logger.info("Using MockVertexAIService")
     return MockVertexAIService()
 
-vertex_ai_service = get_vertex_ai_service()
+async def vertex_ai_service_dependency():
+    """Async dependency wrapper so FastAPI doesn't dispatch to the threadpool per request"""
+    return get_vertex_ai_service()
 
-from app.services.storage.mock_firestore_manager import MockFirestoreSessionManager
-_mock_session_manager = MockFirestoreSessionManager()
+@functools.lru_cache(maxsize=1)
+def get_mock_session_manager():
+    """Get the shared mock session manager"""
+    from app.services.storage.mock_firestore_manager import MockFirestoreSessionManager
+    return MockFirestoreSessionManager()
 
-# Chat history storage
+# Chat history storage (created on first write)
 CHAT_HISTORY_DIR = Path(".mock_firestore_data/chat_history")
-CHAT_HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+_SAFE_FILENAME_TABLE = str.maketrans({'/': '_', ':': '_', '?': '_'})
+
+@functools.lru_cache(maxsize=1)
+def _ensure_chat_history_dir():
+    """Create the chat history directory once"""
+    CHAT_HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+
+# In-memory LRU of hot chat histories keyed by (user_id, paper_id)
+CHAT_HISTORY_CACHE_SIZE = 512
+_HISTORY_CACHE: "OrderedDict[Tuple[str, str], List[Dict]]" = OrderedDict()
+# Keep references to in-flight disk flushes so they are not garbage collected
+_PENDING_FLUSHES: Set[asyncio.Task] = set()
+# Single writer thread keeps appends to the same history file in order; created on first
+# use and again after shutdown_chat_history, so each app lifespan gets a live one
+_history_writer: Optional[ThreadPoolExecutor] = None
+
+# (user_id, paper_id) -> stored paper dict, rebuilt when papers.json changes
+_PAPER_INDEX: Dict[Tuple[str, str], Dict] = {}
+_PAPER_INDEX_MTIME: float = 0.0
+
+# Validates a whole stored history in one call instead of one model per message
+_CHAT_MESSAGE_LIST_ADAPTER = TypeAdapter(List[ChatMessage])
 
 @router.post("/{paper_id:path}/chat", response_model=ChatResponse)
 async def chat_with_paper(
     paper_id: str,
     chat_request: ChatRequest,
     current_user: str = Depends(get_mock_current_user),
-    db = Depends(get_mock_firestore_db)
+    db = Depends(get_mock_firestore_db),
+    vertex_ai_service = Depends(vertex_ai_service_dependency)
 ):
     """
     Chat with a specific paper using AI
     """
     try:
         # Decode the paper_id if it's URL encoded
-        from urllib.parse import unquote
-        decoded_paper_id = unquote(paper_id)
+        decoded_paper_id = _decode_paper_id(paper_id)
         
         logger.info(f"Chat request for paper {decoded_paper_id} from user {current_user}")
         
@@ -67,11 +109,11 @@ async def chat_with_paper(
                 message_id=str(uuid.uuid4()),
                 response="I apologize, but I couldn't find the specific paper in our system. However, I can try to answer your question based on general knowledge. What would you like to know?",
                 papers_referenced=[],
-                timestamp=datetime.utcnow()
+                timestamp=utc_now()
             )
         
         # Load existing chat history
-        chat_history = _load_chat_history(current_user, decoded_paper_id)
+        chat_history = await _load_chat_history(current_user, decoded_paper_id)
         
         # Generate response using AI service
         response_text = await vertex_ai_service.chat_with_paper(
@@ -83,7 +125,7 @@ async def chat_with_paper(
         # Create message IDs
         user_message_id = str(uuid.uuid4())
         assistant_message_id = str(uuid.uuid4())
-        timestamp = datetime.utcnow()
+        timestamp = utc_now()
         
         # Save user message to history
         user_message = ChatMessage(
@@ -106,9 +148,14 @@ async def chat_with_paper(
         )
         
         # Append to history and save
-        chat_history.append(user_message.dict())
-        chat_history.append(assistant_message.dict())
-        _save_chat_history(current_user, decoded_paper_id, chat_history)
+        await _append_chat_history(
+            current_user,
+            decoded_paper_id,
+            [
+                user_message.model_dump(mode='json', exclude_none=True),
+                assistant_message.model_dump(mode='json', exclude_none=True)
+            ]
+        )
         
         return ChatResponse(
             message_id=assistant_message_id,
@@ -132,15 +179,14 @@ async def get_chat_history(
     Get chat history for a paper
     """
     try:
-        from urllib.parse import unquote
-        decoded_paper_id = unquote(paper_id)
+        decoded_paper_id = _decode_paper_id(paper_id)
         
         # Load chat history
-        messages = _load_chat_history(current_user, decoded_paper_id)
+        messages = await _load_chat_history(current_user, decoded_paper_id)
         
         return ChatHistory(
             session_id=decoded_paper_id,
-            messages=[ChatMessage(**msg) for msg in messages],
+            messages=_CHAT_MESSAGE_LIST_ADAPTER.validate_python(messages),
             total_messages=len(messages)
         )
         
@@ -149,70 +195,204 @@ async def get_chat_history(
         raise HTTPException(status_code=500, detail="Failed to get chat history")
 
 
-def _get_chat_history_file(user_id: str, paper_id: str) -> Path:
-    """Get the chat history file path for a specific user and paper"""
-    # Create a safe filename from paper_id
-    safe_id = paper_id.replace('/', '_').replace(':', '_').replace('?', '_')
-    filename = f"{user_id}_{safe_id}.json"
-    return CHAT_HISTORY_DIR / filename
+@functools.lru_cache(maxsize=2048)
+def _decode_paper_id(paper_id: str) -> str:
+    """Decode a URL-encoded paper_id (memoized for repeat chats)"""
+    return unquote(paper_id)
+
+
+@functools.lru_cache(maxsize=2048)
+def _safe_chat_history_name(user_id: str, paper_id: str) -> str:
+    """Create a safe base filename from user_id and paper_id"""
+    return f"{user_id}_{paper_id.translate(_SAFE_FILENAME_TABLE)}"
+
+
+def _chat_history_file(user_id: str, paper_id: str) -> Path:
+    """Get the JSON Lines chat history file path for a specific user and paper"""
+    return CHAT_HISTORY_DIR / f"{_safe_chat_history_name(user_id, paper_id)}.jsonl"
+
+
+def _legacy_chat_history_file(user_id: str, paper_id: str) -> Path:
+    """Get the pre-JSONL chat history file path (single JSON array)"""
+    return CHAT_HISTORY_DIR / f"{_safe_chat_history_name(user_id, paper_id)}.json"
+
+
+def _get_history_writer() -> ThreadPoolExecutor:
+    """Return the chat history writer thread, creating it if needed"""
+    global _history_writer
+    if _history_writer is None:
+        _history_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-history")
+    return _history_writer
+
+
+async def _load_chat_history(user_id: str, paper_id: str) -> List[Dict]:
+    """Load chat history from the in-memory cache, falling back to file"""
+    key = (user_id, paper_id)
+    messages = _HISTORY_CACHE.get(key)
+    if messages is not None:
+        _HISTORY_CACHE.move_to_end(key)
+        return messages
+
+    # Read on the writer thread so the load is ordered after any pending flush of this history
+    loop = asyncio.get_running_loop()
+    messages = await loop.run_in_executor(_get_history_writer(), _read_chat_history_file, user_id, paper_id)
+
+    # A concurrent load may have cached (and extended) this history while we were reading
+    cached = _HISTORY_CACHE.get(key)
+    if cached is not None:
+        _HISTORY_CACHE.move_to_end(key)
+        return cached
+    _cache_chat_history(key, messages)
+    return messages
+
+
+async def _append_chat_history(user_id: str, paper_id: str, new_messages: List[Dict]):
+    """Append messages to the cached chat history and to file in the background"""
+    (await _load_chat_history(user_id, paper_id)).extend(new_messages)
+
+    task = asyncio.create_task(_flush_chat_history(user_id, paper_id, new_messages))
+    _PENDING_FLUSHES.add(task)
+    task.add_done_callback(_PENDING_FLUSHES.discard)
+
+
+async def shutdown_chat_history():
+    """Wait for queued history flushes, then stop the writer thread (call on app shutdown)"""
+    global _history_writer
+    if _PENDING_FLUSHES:
+        await asyncio.gather(*list(_PENDING_FLUSHES), return_exceptions=True)
+    if _history_writer is not None:
+        _history_writer.shutdown(wait=True)
+        _history_writer = None
+
+
+def _cache_chat_history(key: Tuple[str, str], messages: List[Dict]):
+    """Insert chat history into the LRU cache, evicting the oldest entry if full"""
+    _HISTORY_CACHE[key] = messages
+    _HISTORY_CACHE.move_to_end(key)
+    while len(_HISTORY_CACHE) > CHAT_HISTORY_CACHE_SIZE:
+        # Every message is queued for flushing on the writer thread, and reloads run on the same
+        # thread after those flushes, so evicted entries can simply be dropped
+        _HISTORY_CACHE.popitem(last=False)
 
 
-def _load_chat_history(user_id: str, paper_id: str) -> List[Dict]:
-    """Load chat history from file"""
+def _encode_chat_message(message: Dict) -> bytes:
+    """Encode a single (already JSON-safe) chat message as one JSON Lines record"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message) + b"\n"
+    return (json.dumps(message) + "\n").encode('utf-8')
+
+
+def _read_chat_history_file(user_id: str, paper_id: str) -> List[Dict]:
+    """Load chat history from file, migrating legacy JSON files to JSONL"""
     try:
-        history_file = _get_chat_history_file(user_id, paper_id)
+        history_file = _chat_history_file(user_id, paper_id)
         if history_file.exists():
-            with open(history_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+            with open(history_file, 'rb') as f:
+                return [loads(line) for line in f if line.strip()]
+
+        legacy_file = _legacy_chat_history_file(user_id, paper_id)
+        if legacy_file.exists():
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                messages = json.load(f)
+            history_file.write_bytes(b"".join(_encode_chat_message(msg) for msg in messages))
+            legacy_file.unlink()
+            logger.info(f"Migrated chat history to JSONL: {len(messages)} messages")
+            return messages
+
         return []
     except Exception as e:
         logger.error(f"Error loading chat history: {e}")
         return []
 
 
-def _save_chat_history(user_id: str, paper_id: str, messages: List[Dict]):
-    """Save chat history to file"""
+async def _flush_chat_history(user_id: str, paper_id: str, new_messages: List[Dict]):
+    """Append new chat messages to the history file off the event loop"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_get_history_writer(), _write_chat_history_file, user_id, paper_id, new_messages)
+
+
+def _write_chat_history_file(user_id: str, paper_id: str, new_messages: List[Dict]):
+    """Append new chat messages to the history file"""
     try:
-        history_file = _get_chat_history_file(user_id, paper_id)
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(messages, f, indent=2, default=str)
-        logger.info(f"Saved chat history: {len(messages)} messages")
+        _ensure_chat_history_dir()
+        history_file = _chat_history_file(user_id, paper_id)
+        with open(history_file, 'ab') as f:
+            f.write(b"".join(_encode_chat_message(msg) for msg in new_messages))
+        logger.info(f"Saved chat history: {len(new_messages)} new messages")
     except Exception as e:
         logger.error(f"Error saving chat history: {e}")
 
 
+def _load_papers_file(path: str) -> Dict:
+    """Parse the mock papers file straight from a read-only memory map"""
+    try:
+        with open(path, 'rb') as f:
+            if not ORJSON_AVAILABLE or os.fstat(f.fileno()).st_size == 0:
+                return json.loads(f.read() or b'{}')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    except Exception as e:
+        logger.warning(f"Error loading {path}: {e}")
+        return {}
+
+
+def _refresh_paper_index():
+    """Rebuild the paper index if the mock papers file changed since last build"""
+    global _PAPER_INDEX, _PAPER_INDEX_MTIME
+
+    session_manager = get_mock_session_manager()
+    mtime = os.stat(session_manager.papers_file).st_mtime
+    if mtime == _PAPER_INDEX_MTIME:
+        return
+
+    papers_data = _load_papers_file(session_manager.papers_file)
+    index: Dict[Tuple[str, str], Dict] = {}
+    for session_key, papers_list in papers_data.items():
+        # Session keys are "{user_id}_{session_id}" and session IDs are UUIDs
+        owner = session_key.rsplit('_', 1)[0]
+        for paper_entry in papers_list:
+            paper_data = paper_entry.get('paper', {})
+            if 'id' in paper_data:
+                index.setdefault((owner, paper_data['id']), paper_data)
+
+    _PAPER_INDEX = index
+    _PAPER_INDEX_MTIME = mtime
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_paper(user_id: str, paper_id: str, index_mtime: float) -> Optional[Paper]:
+    """
+    Reconstruct a Paper from the index. Keyed by the index mtime so repeated
+    chats about the same paper share one instance until papers.json changes.
+    """
+    paper_data = _PAPER_INDEX.get((user_id, paper_id))
+    if paper_data is None:
+        return None
+
+    from app.models.paper import PaperSource
+    return Paper(
+        id=paper_data['id'],
+        title=paper_data['title'],
+        abstract=paper_data['abstract'],
+        authors=paper_data['authors'],
+        published=paper_data['published'],
+        pdf_url=paper_data.get('pdf_url'),
+        source=PaperSource(paper_data['source']),
+        doi=paper_data.get('doi'),
+        citation_count=paper_data.get('citation_count'),
+        venue=paper_data.get('venue'),
+        keywords=paper_data.get('keywords', [])
+    )
+
+
 async def _find_paper_by_id(user_id: str, paper_id: str) -> Optional[Paper]:
     """Helper function to find a paper by ID across all sessions"""
     try:
-        # Load papers data
-        papers_data = _mock_session_manager._load_json(_mock_session_manager.papers_file)
-        
-        # Search through all user sessions
-        for session_key, papers_list in papers_data.items():
-            if not session_key.startswith(user_id):
-                continue
-                
-            for paper_entry in papers_list:
-                paper_data = paper_entry.get('paper', {})
-                if paper_data.get('id') == paper_id:
-                    # Reconstruct Paper object
-                    from app.models.paper import PaperSource
-                    return Paper(
-                        id=paper_data['id'],
-                        title=paper_data['title'],
-                        abstract=paper_data['abstract'],
-                        authors=paper_data['authors'],
-                        published=paper_data['published'],
-                        pdf_url=paper_data.get('pdf_url'),
-                        source=PaperSource(paper_data['source']),
-                        doi=paper_data.get('doi'),
-                        citation_count=paper_data.get('citation_count'),
-                        venue=paper_data.get('venue'),
-                        keywords=paper_data.get('keywords', [])
-                    )
-        
-        return None
-        
+        await asyncio.to_thread(_refresh_paper_index)
+        return _build_paper(user_id, paper_id, _PAPER_INDEX_MTIME)
+
     except Exception as e:
         logger.error(f"Error finding paper: {e}")
         return None
@@ -1,27 +1,48 @@
 # app/api/v1/endpoints/search.py
 import asyncio
 import logging
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional
 from google.cloud import firestore  # ✅ Correct
 from app.core.dependencies import get_current_user, check_api_quota, increment_api_usage
-from app.core.database import get_firestore_db
+from app.core.database import get_firestore_db_async
 from app.models.search import (
     PaperSearchRequest, SearchResponse, SearchStatusResponse,
-    SearchResults, SearchStatus
+    SearchResults, SearchSession, SearchStatus
 )
-from app.models.paper import PaperWithAnalysis
+from app.models.paper import Paper, PaperWithAnalysis
 from app.services.paper_search.aggregator import PaperSearchAggregator
 from app.services.llm.vertex_ai import VertexAIService
 from app.services.storage.firestore_manager import FirestoreSessionManager
 from google.cloud.firestore import Client
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
 # Initialize services
 search_aggregator = PaperSearchAggregator()
 vertex_ai_service = VertexAIService()
+_session_manager: Optional[FirestoreSessionManager] = None
+
+# Papers per concurrent analysis request in background search tasks
+ANALYSIS_CHUNK_SIZE = 5
+
+def _get_session_manager(db: Client) -> FirestoreSessionManager:
+    """
+    Return a shared FirestoreSessionManager for the Firestore client
+    """
+    global _session_manager
+    if _session_manager is None or _session_manager.db is not db:
+        _session_manager = FirestoreSessionManager(db)
+    return _session_manager
+
+async def get_session_manager(db: Client = Depends(get_firestore_db_async)) -> FirestoreSessionManager:
+    """
+    Dependency returning the shared FirestoreSessionManager
+    """
+    return _get_session_manager(db)
 
 @router.post("/search", response_model=SearchResponse)
 async def search_papers(
@@ -29,7 +50,7 @@ async def search_papers(
     background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user),
     _: bool = Depends(check_api_quota),
-    db: Client = Depends(get_firestore_db)
+    db: Client = Depends(get_firestore_db_async)
 ):
     """
     Start a new paper search across multiple sources
@@ -42,7 +63,7 @@ async def search_papers(
             logger.error("Firestore database is None - check Firebase initialization")
             raise HTTPException(status_code=503, detail="Database not available. Please check Firebase configuration.")
         
-        session_manager = FirestoreSessionManager(db)
+        session_manager = _get_session_manager(db)
 
         # Create new session
         session_id = await session_manager.create_session(current_user, search_request)
@@ -77,13 +98,12 @@ async def search_papers(
 async def get_search_status(
     session_id: str,
     current_user: str = Depends(get_current_user),
-    db: Client = Depends(get_firestore_db)
+    session_manager: FirestoreSessionManager = Depends(get_session_manager)
 ):
     """
     Get the status of a search session
     """
     try:
-        session_manager = FirestoreSessionManager(db)
         session = await session_manager.get_session(current_user, session_id)
 
         if not session:
@@ -108,14 +128,12 @@ async def get_search_status(
 async def get_search_results(
     session_id: str,
     current_user: str = Depends(get_current_user),
-    db: Client = Depends(get_firestore_db)
+    session_manager: FirestoreSessionManager = Depends(get_session_manager)
 ):
     """
     Get the results of a completed search session
     """
     try:
-        session_manager = FirestoreSessionManager(db)
-
         # Get session info
         session = await session_manager.get_session(current_user, session_id)
         if not session:
@@ -124,9 +142,9 @@ async def get_search_results(
         # Get papers with analysis
         papers_with_analysis = await session_manager.get_session_papers(current_user, session_id)
 
-        return SearchResults(
-            session=session,
-            papers=papers_with_analysis
+        return StreamingResponse(
+            _stream_search_results(session, papers_with_analysis),
+            media_type="application/json"
         )
 
     except HTTPException:
@@ -135,18 +153,40 @@ async def get_search_results(
         logger.error(f"Error getting search results: {e}")
         raise HTTPException(status_code=500, detail="Failed to get search results")
 
+async def _stream_search_results(
+    session: SearchSession,
+    papers_with_analysis: List[PaperWithAnalysis]
+) -> AsyncIterator[bytes]:
+    """
+    Emit SearchResults as a JSON document one paper at a time so the socket
+    starts filling before the whole payload is serialized.
+
+    Headers are already sent once streaming starts, so a mid-stream failure
+    cannot become a 500; instead the papers array is closed and an "error"
+    key is appended to the document.
+    """
+    yield b'{"session":' + orjson.dumps(session.model_dump()) + b',"papers":['
+    try:
+        for i, paper_with_analysis in enumerate(papers_with_analysis):
+            chunk = orjson.dumps(paper_with_analysis.model_dump())
+            yield b',' + chunk if i else chunk
+    except Exception as e:
+        logger.error(f"Error streaming search results for session {session.session_id}: {e}")
+        yield b'],"error":' + orjson.dumps(str(e)) + b'}'
+        return
+    yield b']}'
+
 @router.get("/sessions", response_model=List[SearchStatusResponse])
 async def get_user_sessions(
     limit: int = 20,
     status_filter: Optional[SearchStatus] = None,
     current_user: str = Depends(get_current_user),
-    db: Client = Depends(get_firestore_db)
+    session_manager: FirestoreSessionManager = Depends(get_session_manager)
 ):
     """
     Get user's search sessions
     """
     try:
-        session_manager = FirestoreSessionManager(db)
         sessions = await session_manager.get_user_sessions(
             current_user,
             limit=limit,
@@ -157,6 +197,8 @@ async def get_user_sessions(
             SearchStatusResponse(
                 session_id=session.session_id,
                 status=session.status,
+                query=session.query,
+                sources=session.sources,
                 results_count=session.results_count,
                 error_message=session.error_message,
                 created_at=session.created_at,
@@ -173,14 +215,12 @@ async def get_user_sessions(
 async def delete_session(
     session_id: str,
     current_user: str = Depends(get_current_user),
-    db: Client = Depends(get_firestore_db)
+    session_manager: FirestoreSessionManager = Depends(get_session_manager)
 ):
     """
     Delete a search session and its data
     """
     try:
-        session_manager = FirestoreSessionManager(db)
-
         # Verify session exists and belongs to user
         session = await session_manager.get_session(current_user, session_id)
         if not session:
@@ -202,6 +242,20 @@ async def delete_session(
         raise HTTPException(status_code=500, detail="Failed to delete session")
 
 # Background task functions
+async def _analyze_papers(papers: List[Paper]) -> List[PaperWithAnalysis]:
+    """
+    Analyze a chunk of papers and pair each paper with its analysis
+    """
+    analyses = await vertex_ai_service.analyze_papers_batch(papers)
+
+    # Match papers with their analyses
+    analysis_map = {analysis.paper_id: analysis for analysis in analyses}
+
+    return [
+        PaperWithAnalysis(paper=paper, analysis=analysis_map.get(paper.id))
+        for paper in papers
+    ]
+
 async def process_search_task(
     session_id: str,
     user_id: str,
@@ -211,7 +265,7 @@ async def process_search_task(
     """
     Background task to process the search request
     """
-    session_manager = FirestoreSessionManager(db)
+    session_manager = _get_session_manager(db)
 
     try:
         logger.info(f"Processing search task for session {session_id}")
@@ -240,28 +294,26 @@ async def process_search_task(
         logger.info(f"Found {len(papers)} papers for session {session_id}")
 
         # Generate analysis if requested
-        papers_with_analysis = []
         if search_request.generate_analysis:
             logger.info(f"Generating analysis for {len(papers)} papers")
-            analyses = await vertex_ai_service.analyze_papers_batch(papers)
 
-            # Match papers with their analyses
-            analysis_map = {analysis.paper_id: analysis for analysis in analyses}
+            async def analyze_and_store(chunk):
+                papers_with_analysis = await _analyze_papers(chunk)
+                await session_manager.store_papers(user_id, session_id, papers_with_analysis)
 
-            for paper in papers:
-                analysis = analysis_map.get(paper.id)
-                papers_with_analysis.append(PaperWithAnalysis(
-                    paper=paper,
-                    analysis=analysis
-                ))
+            # Analyze chunks concurrently; each chunk is stored as soon as it is ready
+            await asyncio.gather(*[
+                analyze_and_store(papers[i:i + ANALYSIS_CHUNK_SIZE])
+                for i in range(0, len(papers), ANALYSIS_CHUNK_SIZE)
+            ])
         else:
             papers_with_analysis = [
                 PaperWithAnalysis(paper=paper, analysis=None)
                 for paper in papers
             ]
 
-        # Store papers and analyses
-        await session_manager.store_papers(user_id, session_id, papers_with_analysis)
+            # Store papers
+            await session_manager.store_papers(user_id, session_id, papers_with_analysis)
 
         # Update session as completed
         await session_manager.update_session_status(
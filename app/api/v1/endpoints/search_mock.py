@@ -1,8 +1,10 @@
 # app/api/v1/endpoints/search_mock.py
 import asyncio
 import logging
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional
 
 # Use mock dependencies
 from app.core.mock_dependencies import (
@@ -11,14 +13,14 @@ from app.core.mock_dependencies import (
 
 from app.models.search import (
     PaperSearchRequest, SearchResponse, SearchStatusResponse,
-    SearchResults, SearchStatus
+    SearchResults, SearchSession, SearchStatus
 )
 from app.models.paper import PaperWithAnalysis
 from app.services.paper_search.aggregator import PaperSearchAggregator
 from app.services.llm.mock_vertex_ai import MockVertexAIService
 from app.services.storage.mock_firestore_manager import MockFirestoreSessionManager
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
 # Initialize services as singletons
@@ -26,6 +28,9 @@ search_aggregator = PaperSearchAggregator()
 vertex_ai_service = MockVertexAIService()
 _mock_session_manager = MockFirestoreSessionManager()
 
+# Papers per concurrent analysis request in background search tasks
+ANALYSIS_CHUNK_SIZE = 5
+
 @router.post("/search", response_model=SearchResponse)
 async def search_papers(
     search_request: PaperSearchRequest,
@@ -117,9 +122,9 @@ async def get_search_results(
         # Get papers with analysis
         papers_with_analysis = await _mock_session_manager.get_session_papers(current_user, session_id)
 
-        return SearchResults(
-            session=session,
-            papers=papers_with_analysis
+        return StreamingResponse(
+            _stream_search_results(session, papers_with_analysis),
+            media_type="application/json"
         )
 
     except HTTPException:
@@ -128,6 +133,29 @@ async def get_search_results(
         logger.error(f"Error getting search results: {e}")
         raise HTTPException(status_code=500, detail="Failed to get search results")
 
+async def _stream_search_results(
+    session: SearchSession,
+    papers_with_analysis: List[PaperWithAnalysis]
+) -> AsyncIterator[bytes]:
+    """
+    Emit SearchResults as a JSON document one paper at a time so the socket
+    starts filling before the whole payload is serialized.
+
+    Headers are already sent once streaming starts, so a mid-stream failure
+    cannot become a 500; instead the papers array is closed and an "error"
+    key is appended to the document.
+    """
+    yield b'{"session":' + orjson.dumps(session.model_dump()) + b',"papers":['
+    try:
+        for i, paper_with_analysis in enumerate(papers_with_analysis):
+            chunk = orjson.dumps(paper_with_analysis.model_dump())
+            yield b',' + chunk if i else chunk
+    except Exception as e:
+        logger.error(f"Error streaming search results for session {session.session_id}: {e}")
+        yield b'],"error":' + orjson.dumps(str(e)) + b'}'
+        return
+    yield b']}'
+
 @router.get("/sessions", response_model=List[SearchStatusResponse])
 async def get_user_sessions(
     limit: int = 20,
@@ -150,6 +178,8 @@ async def get_user_sessions(
             SearchStatusResponse(
                 session_id=session.session_id,
                 status=session.status,
+                query=session.query,
+                sources=session.sources,
                 results_count=session.results_count,
                 error_message=session.error_message,
                 created_at=session.created_at,
@@ -230,7 +260,12 @@ async def process_search_task(
         papers_with_analysis = []
         if search_request.generate_analysis:
             logger.info(f"Generating analysis for {len(papers)} papers")
-            analyses = await vertex_ai_service.analyze_papers_batch(papers)
+            # Analyze chunks concurrently, then flatten back into one list
+            chunk_analyses = await asyncio.gather(*[
+                vertex_ai_service.analyze_papers_batch(papers[i:i + ANALYSIS_CHUNK_SIZE])
+                for i in range(0, len(papers), ANALYSIS_CHUNK_SIZE)
+            ])
+            analyses = [analysis for chunk in chunk_analyses for analysis in chunk]
 
             # Match papers with their analyses
             analysis_map = {analysis.paper_id: analysis for analysis in analyses}
@@ -1,8 +1,9 @@
 # app/api/v1/router.py
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from app.api.v1.endpoints import search_mock, chat
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 api_router.include_router(
     search_mock.router,
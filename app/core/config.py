@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
+from functools import cached_property
+from dotenv import load_dotenv
 import os
 import secrets
 
@@ -17,6 +19,7 @@ class Settings(BaseSettings):
     google_application_credentials: Optional[str] = None
     vertex_ai_location: str = "us-central1"
     vertex_ai_api_key: Optional[str] = None
+    vertex_ai_concurrency: int = 8  # Max in-flight Gemini requests per process
     gcs_bucket_name: str = "research-papers-bucket"
 
     # Firebase Configuration
@@ -43,6 +46,7 @@ class Settings(BaseSettings):
 
     # CORS Configuration
     allowed_origins: str = "http://localhost:3000,http://localhost:8080"
+    cors_max_age: int = 86400  # Seconds browsers may cache preflight responses
     
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(
@@ -62,10 +66,13 @@ class Settings(BaseSettings):
         """Check if running in production mode"""
         return self.environment.lower() == "production"
     
-    @property
-    def allowed_origins_list(self) -> list[str]:
-        """Convert allowed origins string to list"""
-        return [origin.strip() for origin in self.allowed_origins.split(",")]
+    @cached_property
+    def allowed_origins_list(self) -> tuple[str, ...]:
+        """Convert allowed origins string to a tuple (parsed once)"""
+        return tuple(origin.strip() for origin in self.allowed_origins.split(","))
+
+# Export .env to os.environ once per process for SDKs that read it directly
+load_dotenv()
 
 # Create settings instance
 settings = Settings()
\ No newline at end of file
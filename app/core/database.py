@@ -60,6 +60,13 @@ def get_firestore_db() -> Client:
     """Dependency function to get Firestore database"""
     return FirebaseConnection.get_db()
 
+async def get_firestore_db_async() -> Client:
+    """
+    Async variant of get_firestore_db for use with Depends.
+    FastAPI runs sync dependencies in the threadpool on every request.
+    """
+    return FirebaseConnection.get_db()
+
 # Initialize on import
 try:
     FirebaseConnection.initialize()
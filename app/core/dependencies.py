@@ -1,13 +1,47 @@
 # app/core/dependencies.py
 from fastapi import Depends, HTTPException, Header, status
 from firebase_admin import auth
+from google.cloud import firestore
 from google.cloud.firestore import Client
-from app.core.database import get_firestore_db
-from typing import Optional, Dict, Any
+from app.core.database import get_firestore_db_async
+from typing import Optional, Dict, Any, Tuple
+from collections import defaultdict
+from types import MappingProxyType
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Quotas per subscription tier (-1 = unlimited)
+_QUOTAS = MappingProxyType({
+    'free': MappingProxyType({'monthly_searches': 50, 'papers_per_search': 10}),
+    'premium': MappingProxyType({'monthly_searches': 500, 'papers_per_search': 50}),
+    'enterprise': MappingProxyType({'monthly_searches': -1, 'papers_per_search': 100})
+})
+
+# Short-lived cache of user documents so bursts of requests don't each hit Firestore
+USER_CACHE_TTL_SECONDS = 30
+_USER_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+def _get_cached_user_data(user_id: str) -> Optional[Dict[str, Any]]:
+    """Return the cached user document if it is still fresh"""
+    entry = _USER_CACHE.get(user_id)
+    if entry and time.monotonic() - entry[0] < USER_CACHE_TTL_SECONDS:
+        return entry[1]
+    return None
+
+def _cache_user_data(user_id: str, user_data: Dict[str, Any]):
+    """Store a user document in the TTL cache"""
+    _USER_CACHE[user_id] = (time.monotonic(), user_data)
+
+# Usage increments are accumulated in-process and flushed to Firestore periodically
+USAGE_FLUSH_INTERVAL_SECONDS = 5
+FIRESTORE_BATCH_LIMIT = 500  # Max writes per Firestore batch commit
+_PENDING_USAGE: Dict[str, Dict[str, int]] = defaultdict(lambda: {'searches': 0, 'papers': 0})
+_PENDING_USAGE_LOCK = asyncio.Lock()
+_usage_flush_task: Optional[asyncio.Task] = None
+
 class AuthenticationError(HTTPException):
     """Custom authentication error"""
     def __init__(self, detail: str = "Authentication failed"):
@@ -73,12 +107,16 @@ async def get_current_user_optional(authorization: str = Header(None)) -> Option
 
 async def get_user_profile(
     current_user: str = Depends(get_current_user),
-    db: Client = Depends(get_firestore_db)
+    db: Client = Depends(get_firestore_db_async)
 ) -> Dict[str, Any]:
     """
     Get user profile from Firestore
     """
     try:
+        cached = _get_cached_user_data(current_user)
+        if cached is not None:
+            return cached
+
         user_doc = db.collection('users').document(current_user).get()
         if not user_doc.exists:
             # Create basic user profile if doesn't exist
@@ -93,9 +131,12 @@ async def get_user_profile(
                 }
             }
             db.collection('users').document(current_user).set(user_data, merge=True)
+            _cache_user_data(current_user, user_data)
             return user_data
 
-        return user_doc.to_dict()
+        user_data = user_doc.to_dict()
+        _cache_user_data(current_user, user_data)
+        return user_data
 
     except Exception as e:
         logger.error(f"Error fetching user profile: {e}")
@@ -106,31 +147,29 @@ async def get_user_profile(
 
 async def check_api_quota(
     current_user: str = Depends(get_current_user),
-    db: Client = Depends(get_firestore_db)
+    db: Client = Depends(get_firestore_db_async)
 ) -> bool:
     """
     Check if user has remaining API quota
     """
     try:
-        user_doc = db.collection('users').document(current_user).get()
+        user_data = _get_cached_user_data(current_user)
 
-        if not user_doc.exists:
-            return True  # New user, allow usage
+        if user_data is None:
+            user_doc = db.collection('users').document(current_user).get()
+
+            if not user_doc.exists:
+                return True  # New user, allow usage
+
+            user_data = user_doc.to_dict()
+            _cache_user_data(current_user, user_data)
 
-        user_data = user_doc.to_dict()
         research_profile = user_data.get('research_profile', {})
         api_usage = research_profile.get('api_usage', {})
         tier = research_profile.get('subscription_tier', 'free')
 
-        # Define quotas per tier
-        quotas = {
-            'free': {'monthly_searches': 50, 'papers_per_search': 10},
-            'premium': {'monthly_searches': 500, 'papers_per_search': 50},
-            'enterprise': {'monthly_searches': -1, 'papers_per_search': 100}  # -1 = unlimited
-        }
-
         current_searches = api_usage.get('searches_this_month', 0)
-        max_searches = quotas.get(tier, quotas['free'])['monthly_searches']
+        max_searches = _QUOTAS.get(tier, _QUOTAS['free'])['monthly_searches']
 
         if max_searches == -1:  # Unlimited
             return True
@@ -157,34 +196,98 @@ async def increment_api_usage(
 ):
     """
     Increment user's API usage counters
+
+    Increments are buffered and written by the background flush started with
+    start_usage_flush, so the request path never waits on Firestore.
     """
     try:
-        user_ref = db.collection('users').document(current_user)
+        async with _PENDING_USAGE_LOCK:
+            pending = _PENDING_USAGE[current_user]
+            pending['searches'] += searches
+            pending['papers'] += papers
 
-        # Use transaction to safely increment counters
-        @firestore.transactional
-        def update_usage(transaction):
-            doc = user_ref.get(transaction=transaction)
-            current_data = doc.to_dict() if doc.exists else {}
+        # Keep cached counters in step so quota checks see the new usage
+        cached = _get_cached_user_data(current_user)
+        if cached is not None:
+            api_usage = cached.setdefault('research_profile', {}).setdefault('api_usage', {})
+            api_usage['searches_this_month'] = api_usage.get('searches_this_month', 0) + searches
+            api_usage['papers_analyzed'] = api_usage.get('papers_analyzed', 0) + papers
 
-            research_profile = current_data.get('research_profile', {})
-            api_usage = research_profile.get('api_usage', {
-                'searches_this_month': 0,
-                'papers_analyzed': 0,
-                'last_reset': '2024-01-01T00:00:00Z'
-            })
+    except Exception as e:
+        logger.error(f"Error incrementing API usage: {e}")
+        # Don't raise exception here to avoid breaking the main flow
 
-            api_usage['searches_this_month'] += searches
-            api_usage['papers_analyzed'] += papers
+async def flush_api_usage(db: Client):
+    """
+    Write all buffered usage increments to Firestore, in batches of at most
+    FIRESTORE_BATCH_LIMIT users
+    """
+    global _PENDING_USAGE
+
+    async with _PENDING_USAGE_LOCK:
+        pending = _PENDING_USAGE
+        _PENDING_USAGE = defaultdict(lambda: {'searches': 0, 'papers': 0})
 
-            research_profile['api_usage'] = api_usage
-            current_data['research_profile'] = research_profile
+    # Zero counters are left untouched
+    user_ids = [user_id for user_id, counts in pending.items() if counts['searches'] or counts['papers']]
+    if not user_ids:
+        return
 
-            transaction.set(user_ref, current_data, merge=True)
+    committed = 0
+    try:
+        for start in range(0, len(user_ids), FIRESTORE_BATCH_LIMIT):
+            chunk = user_ids[start:start + FIRESTORE_BATCH_LIMIT]
+            batch = db.batch()
+            for user_id in chunk:
+                # Server-side atomic increments
+                counts = pending[user_id]
+                api_usage = {}
+                if counts['searches']:
+                    api_usage['searches_this_month'] = firestore.Increment(counts['searches'])
+                if counts['papers']:
+                    api_usage['papers_analyzed'] = firestore.Increment(counts['papers'])
 
-        transaction = db.transaction()
-        update_usage(transaction)
+                batch.set(db.collection('users').document(user_id), {
+                    'research_profile': {'api_usage': api_usage}
+                }, merge=True)
+
+            await asyncio.to_thread(batch.commit)
+            committed += len(chunk)
+
+        logger.info(f"Flushed API usage for {committed} users")
 
     except Exception as e:
-        logger.error(f"Error incrementing API usage: {e}")
-        # Don't raise exception here to avoid breaking the main flow
\ No newline at end of file
+        logger.error(f"Error flushing API usage: {e}")
+        # Put the uncommitted counts back so they are retried on the next flush
+        async with _PENDING_USAGE_LOCK:
+            for user_id in user_ids[committed:]:
+                counts = pending[user_id]
+                _PENDING_USAGE[user_id]['searches'] += counts['searches']
+                _PENDING_USAGE[user_id]['papers'] += counts['papers']
+
+async def _usage_flush_loop(db: Client):
+    """Periodically flush buffered usage increments"""
+    while True:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL_SECONDS)
+        flush = asyncio.ensure_future(flush_api_usage(db))
+        try:
+            await asyncio.shield(flush)
+        except asyncio.CancelledError:
+            # Stopping mid-flush: let the commit finish so its counts are neither lost nor re-sent
+            await flush
+            raise
+
+def start_usage_flush(db: Client):
+    """Start the background usage flush task (call on app startup)"""
+    global _usage_flush_task
+    if _usage_flush_task is None or _usage_flush_task.done():
+        _usage_flush_task = asyncio.create_task(_usage_flush_loop(db))
+
+async def stop_usage_flush(db: Client):
+    """Stop the background flush and write any remaining increments (call on app shutdown)"""
+    global _usage_flush_task
+    if _usage_flush_task is not None:
+        _usage_flush_task.cancel()
+        await asyncio.gather(_usage_flush_task, return_exceptions=True)
+        _usage_flush_task = None
+    await flush_api_usage(db)
@@ -0,0 +1,34 @@
+# app/core/logging_config.py
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable
+
+def setup_logging(level: int = logging.INFO) -> Callable[[], None]:
+    """
+    Route root logging through a queue.
+    The handlers already on the root logger (basicConfig, uvicorn, pytest's caplog)
+    move behind a QueueListener, so request handlers only enqueue records and a
+    listener thread does the I/O. Call from app startup; returns a teardown for
+    shutdown that stops the listener (writing out queued records) and puts the
+    original handlers back on the root logger.
+    """
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if not handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        handlers = [stream_handler]
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    def teardown():
+        listener.stop()
+        root.handlers[:] = handlers
+
+    return teardown
@@ -2,9 +2,16 @@
 from fastapi import HTTPException, status
 from typing import Optional, Dict, Any
 import logging
+import zlib
 
 logger = logging.getLogger(__name__)
 
+# Well-known test tokens and the user IDs they map to
+_TOKEN_MAP = {
+    'test-token': 'test-user-123',
+    'demo-token': 'demo-user-456',
+}
+
 class MockAuthenticationError(HTTPException):
     """Mock authentication error"""
     def __init__(self, detail: str = "Mock authentication failed"):
@@ -22,14 +29,10 @@ async def get_mock_current_user(authorization: str = None) -> str:
     # For testing, we'll accept any authorization header or return a default user
     if authorization and authorization.startswith('Bearer '):
         # Extract a simple user ID from the token for testing
-        token = authorization.split(' ')[1]
-        if token == 'test-token':
-            return 'test-user-123'
-        elif token == 'demo-token':
-            return 'demo-user-456'
-        else:
-            # For any other token, return a generic test user
-            return f'user-{hash(token) % 1000}'
+        token = authorization[7:]
+        # Any other token maps to a generic test user; crc32 keeps the ID
+        # stable across restarts, unlike the per-process salted hash()
+        return _TOKEN_MAP.get(token) or f'user-{zlib.crc32(token.encode()) & 0x3FF}'
 
     # If no authorization header, return default test user
     return 'default-test-user'
@@ -73,7 +76,8 @@ async def check_mock_api_quota(current_user: str = None) -> bool:
     if not current_user:
         current_user = await get_mock_current_user()
 
-    logger.info(f"Mock quota check for user {current_user} - PASSED")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Mock quota check for user {current_user} - PASSED")
     return True
 
 async def increment_mock_api_usage(
@@ -85,9 +89,10 @@ async def increment_mock_api_usage(
     """
     Mock API usage increment - just logs for testing
     """
-    logger.info(f"Mock usage increment for user {current_user}: +{searches} searches, +{papers} papers")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Mock usage increment for user {current_user}: +{searches} searches, +{papers} papers")
 
-def get_mock_firestore_db():
+async def get_mock_firestore_db():
     """
     Mock Firestore database - returns None as our mock services don't need it
     """
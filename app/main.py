@@ -1,16 +1,12 @@
 # app/main.py
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,18 +15,34 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
+    # Records are written by a background listener thread until teardown
+    teardown_logging = setup_logging(logging.INFO)
     logger.info("Starting up Research Paper API...")
-    # Initialize connections here
+    from app.core.database import FirebaseConnection
+    from app.core.dependencies import start_usage_flush, stop_usage_flush
+
+    # Buffered API usage is flushed in the background and once more on shutdown
+    db = FirebaseConnection.get_db()
+    if db is not None:
+        start_usage_flush(db)
     yield
     # Cleanup
     logger.info("Shutting down...")
+    if db is not None:
+        await stop_usage_flush(db)
+    from app.api.v1.endpoints.chat import shutdown_chat_history
+    from app.api.v1.endpoints.search_mock import search_aggregator
+    await shutdown_chat_history()
+    await search_aggregator.close()
+    teardown_logging()
 
 # Create FastAPI app
 app = FastAPI(
     title="Research Paper Analysis API",
     description="API for searching, analyzing, and querying research papers",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -40,6 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.cors_max_age,
 )
 
 # Include API routes
@@ -1,34 +1,81 @@
 # app/main_full.py - Full FastAPI app with mock dependencies
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 import logging
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.models.analysis import (
+    ResearchGapsRequest, ResearchScopeRequest,
+    ComprehensiveReportRequest, PaperAnalysisRequest
+)
+
+# Characters stripped from report filenames
+_FILENAME_SANITIZE = re.compile(r'[^\w\s-]')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# NOTE: every endpoint here is `async def` and runs on the event loop. Never call
+# synchronous network or CPU-heavy code (SDK clients, ReportLab) directly from
+# them - await an async API or offload it with run_in_threadpool.
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
+    # Records are written by a background listener thread until teardown
+    teardown_logging = setup_logging(logging.INFO)
     logger.info("Starting up Research Paper API (Full with Mocks)...")
+    from app.services.paper_search.aggregator import PaperSearchAggregator
+    from app.services.llm.vertex_ai import VertexAIService
+
+    # Shared service instances; handlers reuse their clients and HTTP sessions
+    app.state.aggregator = PaperSearchAggregator()
+    try:
+        app.state.vertex_ai = VertexAIService()
+    except Exception as e:
+        logger.warning(f"VertexAIService unavailable at startup: {e}")
+        app.state.vertex_ai = None
     yield
     logger.info("Shutting down...")
+    from app.api.v1.endpoints.search_mock import search_aggregator
+    await app.state.aggregator.close()
+    await search_aggregator.close()
+    if app.state.vertex_ai is not None:
+        await app.state.vertex_ai.close()
+    teardown_logging()
+
+class ReportAwareGZipMiddleware:
+    """GZip JSON responses but pass the already-compressed PDF report through untouched"""
+
+    def __init__(self, app, exclude_paths: Tuple[str, ...] = (), **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in self.exclude_paths:
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
 
 # Create FastAPI app
 app = FastAPI(
     title="Research Paper Analysis API",
     description="API for searching, analyzing, and querying research papers",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -38,8 +85,74 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.cors_max_age,
 )
 
+# Compress JSON responses (per-paper analyses are large, highly compressible text)
+app.add_middleware(
+    ReportAwareGZipMiddleware,
+    exclude_paths=("/generate/comprehensive-report",),
+    minimum_size=1024,
+    compresslevel=5,
+)
+
+def _get_vertex_ai_service():
+    """Return the shared VertexAIService, retrying creation if startup failed"""
+    if app.state.vertex_ai is None:
+        from app.services.llm.vertex_ai import VertexAIService
+        app.state.vertex_ai = VertexAIService()
+    return app.state.vertex_ai
+
+# Demo search responses are cached in-process; Scholar is rate limited so it keeps longer
+DEMO_CACHE_TTL_SECONDS = 300
+DEMO_SCHOLAR_CACHE_TTL_SECONDS = 3600
+DEMO_CACHE_MAX_ENTRIES = 256
+_DEMO_CACHE: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+def _get_cached_demo(key: Tuple) -> Optional[Dict[str, Any]]:
+    """Return a cached demo response if it has not expired"""
+    entry = _DEMO_CACHE.get(key)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
+    return None
+
+def _cache_demo(key: Tuple, response: Dict[str, Any], ttl: int = DEMO_CACHE_TTL_SECONDS):
+    """Store a demo response, evicting the oldest entry when full"""
+    # Empty results (rate limited or upstream failure) are retried next time
+    if not response["papers"]:
+        return
+    _DEMO_CACHE[key] = (time.monotonic() + ttl, response)
+    _DEMO_CACHE.move_to_end(key)
+    if len(_DEMO_CACHE) > DEMO_CACHE_MAX_ENTRIES:
+        _DEMO_CACHE.popitem(last=False)
+
+def _truncate(text: str, limit: int = 200) -> str:
+    """Shorten text for list responses, marking cut text with an ellipsis"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def _paper_summaries(papers, include_citations: bool = False) -> List[Dict[str, Any]]:
+    """Project papers to the compact dicts returned by the demo endpoints"""
+    results = []
+    for paper in papers:
+        summary = {
+            "id": paper.id,
+            "title": paper.title,
+            "abstract": _truncate(paper.abstract),
+            "authors": paper.authors,
+            "published": paper.published,
+            "source": str(paper.source),
+            "venue": paper.venue,
+            "pdf_url": paper.pdf_url
+        }
+        if include_citations:
+            summary["citation_count"] = paper.citation_count
+        results.append(summary)
+    return results
+
+def _none():
+    """Awaitable placeholder for optional steps that are skipped"""
+    return asyncio.sleep(0, result=None)
+
 # Include API routes with mock endpoints
 from fastapi import APIRouter
 from app.api.v1.endpoints import search_mock
@@ -77,10 +190,14 @@ async def get_available_sources():
 async def demo_search(query: str = "machine learning", max_results: int = 3):
     """Demo endpoint that shows direct search results"""
     try:
-        from app.services.paper_search.aggregator import PaperSearchAggregator
+        cache_key = ("search", query, max_results)
+        cached = _get_cached_demo(cache_key)
+        if cached is not None:
+            return cached
+
         from app.models.paper import PaperSource
 
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV],
@@ -89,24 +206,15 @@ async def demo_search(query: str = "machine learning", max_results: int = 3):
         )
 
         # Convert papers to dict format for JSON response
-        results = []
-        for paper in papers:
-            results.append({
-                "id": paper.id,
-                "title": paper.title,
-                "abstract": paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract,
-                "authors": paper.authors,
-                "published": paper.published,
-                "source": str(paper.source),
-                "venue": paper.venue,
-                "pdf_url": paper.pdf_url
-            })
+        results = _paper_summaries(papers)
 
-        return {
+        response = {
             "query": query,
             "results_count": len(results),
             "papers": results
         }
+        _cache_demo(cache_key, response)
+        return response
 
     except Exception as e:
         logger.error(f"Demo search error: {e}")
@@ -116,31 +224,27 @@ async def demo_search(query: str = "machine learning", max_results: int = 3):
 async def demo_pubmed_search(query: str = "cancer treatment", max_results: int = 3):
     """Demo endpoint for PubMed search"""
     try:
-        from app.services.paper_search.pubmed_search import PubMedSearcher
+        cache_key = ("pubmed", query, max_results)
+        cached = _get_cached_demo(cache_key)
+        if cached is not None:
+            return cached
+
+        from app.models.paper import PaperSource
 
-        searcher = PubMedSearcher()
+        searcher = app.state.aggregator.sources[PaperSource.PUBMED]
         papers = await searcher.search(query, max_results)
 
         # Convert papers to dict format for JSON response
-        results = []
-        for paper in papers:
-            results.append({
-                "id": paper.id,
-                "title": paper.title,
-                "abstract": paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract,
-                "authors": paper.authors,
-                "published": paper.published,
-                "source": str(paper.source),
-                "venue": paper.venue,
-                "pdf_url": paper.pdf_url
-            })
+        results = _paper_summaries(papers)
 
-        return {
+        response = {
             "query": query,
             "source": "PubMed",
             "results_count": len(results),
             "papers": results
         }
+        _cache_demo(cache_key, response)
+        return response
 
     except Exception as e:
         logger.error(f"Demo PubMed search error: {e}")
@@ -150,10 +254,14 @@ async def demo_pubmed_search(query: str = "cancer treatment", max_results: int =
 async def demo_multi_source_search(query: str = "machine learning", max_results: int = 5):
     """Demo endpoint for multi-source search (arXiv + PubMed)"""
     try:
-        from app.services.paper_search.aggregator import PaperSearchAggregator
+        cache_key = ("multi-source", query, max_results)
+        cached = _get_cached_demo(cache_key)
+        if cached is not None:
+            return cached
+
         from app.models.paper import PaperSource
 
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV, PaperSource.PUBMED],
@@ -162,25 +270,16 @@ async def demo_multi_source_search(query: str = "machine learning", max_results:
         )
 
         # Convert papers to dict format for JSON response
-        results = []
-        for paper in papers:
-            results.append({
-                "id": paper.id,
-                "title": paper.title,
-                "abstract": paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract,
-                "authors": paper.authors,
-                "published": paper.published,
-                "source": str(paper.source),
-                "venue": paper.venue,
-                "pdf_url": paper.pdf_url
-            })
+        results = _paper_summaries(papers)
 
-        return {
+        response = {
             "query": query,
             "sources": ["arXiv", "PubMed"],
             "results_count": len(results),
             "papers": results
         }
+        _cache_demo(cache_key, response)
+        return response
 
     except Exception as e:
         logger.error(f"Demo multi-source search error: {e}")
@@ -190,10 +289,14 @@ async def demo_multi_source_search(query: str = "machine learning", max_results:
 async def demo_google_scholar_search(query: str = "artificial intelligence", max_results: int = 3, user_id: str = "demo_user"):
     """Demo endpoint for Google Scholar search (rate limited - 1 search per user per day)"""
     try:
-        from app.services.paper_search.aggregator import PaperSearchAggregator
+        cache_key = ("google-scholar", query, max_results, user_id)
+        cached = _get_cached_demo(cache_key)
+        if cached is not None:
+            return cached
+
         from app.models.paper import PaperSource
 
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.GOOGLE_SCHOLAR],
@@ -202,21 +305,9 @@ async def demo_google_scholar_search(query: str = "artificial intelligence", max
         )
 
         # Convert papers to dict format for JSON response
-        results = []
-        for paper in papers:
-            results.append({
-                "id": paper.id,
-                "title": paper.title,
-                "abstract": paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract,
-                "authors": paper.authors,
-                "published": paper.published,
-                "source": str(paper.source),
-                "venue": paper.venue,
-                "pdf_url": paper.pdf_url,
-                "citation_count": paper.citation_count
-            })
+        results = _paper_summaries(papers, include_citations=True)
 
-        return {
+        response = {
             "query": query,
             "source": "Google Scholar",
             "user_id": user_id,
@@ -224,6 +315,8 @@ async def demo_google_scholar_search(query: str = "artificial intelligence", max
             "results_count": len(results),
             "papers": results
         }
+        _cache_demo(cache_key, response, DEMO_SCHOLAR_CACHE_TTL_SECONDS)
+        return response
 
     except Exception as e:
         logger.error(f"Demo Google Scholar search error: {e}")
@@ -233,10 +326,14 @@ async def demo_google_scholar_search(query: str = "artificial intelligence", max
 async def demo_all_sources_search(query: str = "machine learning", max_results: int = 6, user_id: str = "demo_user"):
     """Demo endpoint for all sources search (arXiv + PubMed + Google Scholar)"""
     try:
-        from app.services.paper_search.aggregator import PaperSearchAggregator
+        cache_key = ("all-sources", query, max_results, user_id)
+        cached = _get_cached_demo(cache_key)
+        if cached is not None:
+            return cached
+
         from app.models.paper import PaperSource
 
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV, PaperSource.PUBMED, PaperSource.GOOGLE_SCHOLAR],
@@ -245,21 +342,9 @@ async def demo_all_sources_search(query: str = "machine learning", max_results:
         )
 
         # Convert papers to dict format for JSON response
-        results = []
-        for paper in papers:
-            results.append({
-                "id": paper.id,
-                "title": paper.title,
-                "abstract": paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract,
-                "authors": paper.authors,
-                "published": paper.published,
-                "source": str(paper.source),
-                "venue": paper.venue,
-                "pdf_url": paper.pdf_url,
-                "citation_count": paper.citation_count
-            })
+        results = _paper_summaries(papers, include_citations=True)
 
-        return {
+        response = {
             "query": query,
             "sources": ["arXiv", "PubMed", "Google Scholar"],
             "user_id": user_id,
@@ -267,29 +352,29 @@ async def demo_all_sources_search(query: str = "machine learning", max_results:
             "results_count": len(results),
             "papers": results
         }
+        _cache_demo(cache_key, response, DEMO_SCHOLAR_CACHE_TTL_SECONDS)
+        return response
 
     except Exception as e:
         logger.error(f"Demo all sources search error: {e}")
         return {"error": str(e), "query": query, "user_id": user_id, "papers": []}
 
 @app.post("/analyze/research-gaps")
-async def analyze_research_gaps(request: dict):
+async def analyze_research_gaps(request: ResearchGapsRequest):
     """Analyze research gaps from papers using real Vertex AI"""
     try:
-        from app.services.llm.vertex_ai import VertexAIService
-        from app.services.paper_search.aggregator import PaperSearchAggregator
         from app.models.paper import PaperSource
 
-        query = request.get("query", "")
-        research_domain = request.get("research_domain", "")
-        max_papers = request.get("max_papers", 10)
-        user_id = request.get("user_id", "research_gaps_user")
+        query = request.query
+        research_domain = request.research_domain
+        max_papers = request.max_papers
+        user_id = request.user_id
 
         if not query:
             return {"error": "Query is required"}
 
         # Search for papers
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV, PaperSource.PUBMED, PaperSource.GOOGLE_SCHOLAR],
@@ -301,7 +386,7 @@ async def analyze_research_gaps(request: dict):
             return {"error": "No papers found for the given query", "query": query}
 
         # Analyze research gaps using Vertex AI
-        vertex_ai = VertexAIService()
+        vertex_ai = _get_vertex_ai_service()
         research_gaps = await vertex_ai.identify_research_gaps(papers, research_domain)
 
         return {
@@ -316,24 +401,22 @@ async def analyze_research_gaps(request: dict):
         return {"error": str(e), "query": query}
 
 @app.post("/analyze/research-scope")
-async def generate_research_scope(request: dict):
+async def generate_research_scope(request: ResearchScopeRequest):
     """Generate research scope from papers using real Vertex AI"""
     try:
-        from app.services.llm.vertex_ai import VertexAIService
-        from app.services.paper_search.aggregator import PaperSearchAggregator
         from app.models.paper import PaperSource
 
-        query = request.get("query", "")
-        research_question = request.get("research_question", "")
-        timeline_months = request.get("timeline_months", 12)
-        max_papers = request.get("max_papers", 10)
-        user_id = request.get("user_id", "research_scope_user")
+        query = request.query
+        research_question = request.research_question
+        timeline_months = request.timeline_months
+        max_papers = request.max_papers
+        user_id = request.user_id
 
         if not query or not research_question:
             return {"error": "Both query and research_question are required"}
 
         # Search for papers
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV, PaperSource.PUBMED, PaperSource.GOOGLE_SCHOLAR],
@@ -345,7 +428,7 @@ async def generate_research_scope(request: dict):
             return {"error": "No papers found for the given query", "query": query}
 
         # Generate research scope using Vertex AI
-        vertex_ai = VertexAIService()
+        vertex_ai = _get_vertex_ai_service()
         research_scope = await vertex_ai.generate_research_scope(papers, research_question, timeline_months)
 
         return {
@@ -361,31 +444,28 @@ async def generate_research_scope(request: dict):
         return {"error": str(e), "query": query}
 
 @app.post("/generate/comprehensive-report")
-async def generate_comprehensive_report(request: dict):
+async def generate_comprehensive_report(request: ComprehensiveReportRequest):
     """Generate comprehensive PDF report with papers, analysis, gaps, and scope"""
     try:
-        from app.services.llm.vertex_ai import VertexAIService
-        from app.services.paper_search.aggregator import PaperSearchAggregator
         from app.models.paper import PaperSource
         from fastapi.responses import StreamingResponse
-        from io import BytesIO
-
-        query = request.get("query", "")
-        research_question = request.get("research_question", "")
-        research_domain = request.get("research_domain", "")
-        max_papers = request.get("max_papers", 8)
-        timeline_months = request.get("timeline_months", 12)
-        report_title = request.get("report_title", "Comprehensive Research Analysis Report")
-        user_id = request.get("user_id", "report_user")
-        include_analysis = request.get("include_analysis", True)
-        include_gaps = request.get("include_gaps", True)
-        include_scope = request.get("include_scope", True)
+
+        query = request.query
+        research_question = request.research_question
+        research_domain = request.research_domain
+        max_papers = request.max_papers
+        timeline_months = request.timeline_months
+        report_title = request.report_title
+        user_id = request.user_id
+        include_analysis = request.include_analysis
+        include_gaps = request.include_gaps
+        include_scope = request.include_scope
 
         if not query:
             return {"error": "Query is required"}
 
         # Search for papers
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV, PaperSource.PUBMED, PaperSource.GOOGLE_SCHOLAR],
@@ -397,46 +477,46 @@ async def generate_comprehensive_report(request: dict):
             return {"error": "No papers found for the given query", "query": query}
 
         # Initialize Vertex AI service
-        vertex_ai = VertexAIService()
+        vertex_ai = _get_vertex_ai_service()
 
-        # Generate paper analyses if requested
-        analyses = None
+        # Analyses, gaps and scope only depend on the papers, so run them concurrently
+        analyses_coro = _none()
         if include_analysis:
             logger.info(f"Generating AI analyses for {len(papers)} papers...")
-            analyses = await vertex_ai.analyze_papers_batch(papers[:5])  # Limit to 5 for cost control
+            analyses_coro = vertex_ai.analyze_papers_batch(papers[:5])  # Limit to 5 for cost control
 
-        # Identify research gaps if requested
-        research_gaps = None
+        gaps_coro = _none()
         if include_gaps:
             logger.info("Identifying research gaps...")
-            research_gaps = await vertex_ai.identify_research_gaps(papers, research_domain)
+            gaps_coro = vertex_ai.identify_research_gaps(papers, research_domain)
 
-        # Generate research scope if requested
-        research_scope = None
+        scope_coro = _none()
         if include_scope and research_question:
             logger.info("Generating research scope...")
-            research_scope = await vertex_ai.generate_research_scope(papers, research_question, timeline_months)
+            scope_coro = vertex_ai.generate_research_scope(papers, research_question, timeline_months)
 
-        # Generate PDF report
+        analyses, research_gaps, research_scope = await asyncio.gather(
+            analyses_coro, gaps_coro, scope_coro
+        )
+
+        # Generate PDF report (CPU-bound ReportLab rendering runs off the event loop)
         logger.info("Generating comprehensive PDF report...")
-        pdf_bytes = await vertex_ai.generate_comprehensive_report_pdf(
+        pdf_file = await run_in_threadpool(
+            vertex_ai.render_comprehensive_report_pdf_sync,
             papers=papers,
             analyses=analyses,
             research_gaps=research_gaps,
             research_scope=research_scope,
-            custom_title=report_title
+            report_title=report_title
         )
 
-        # Return PDF as streaming response
-        pdf_buffer = BytesIO(pdf_bytes)
-
         # Create safe filename
-        import re
-        safe_filename = re.sub(r'[^\w\s-]', '', query.replace(' ', '_'))[:50]
+        safe_filename = _FILENAME_SANITIZE.sub('', query.replace(' ', '_'))[:50]
         filename = f"research_report_{safe_filename}.pdf"
 
+        # Stream the rendered PDF in chunks straight from the spooled file
         return StreamingResponse(
-            BytesIO(pdf_bytes),
+            vertex_ai.iter_pdf_chunks(pdf_file),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -446,22 +526,20 @@ async def generate_comprehensive_report(request: dict):
         return {"error": str(e), "query": query}
 
 @app.post("/analyze/papers-with-ai")
-async def analyze_papers_with_ai(request: dict):
+async def analyze_papers_with_ai(request: PaperAnalysisRequest):
     """Analyze specific papers with Vertex AI"""
     try:
-        from app.services.llm.vertex_ai import VertexAIService
-        from app.services.paper_search.aggregator import PaperSearchAggregator
         from app.models.paper import PaperSource
 
-        query = request.get("query", "")
-        max_papers = request.get("max_papers", 5)
-        user_id = request.get("user_id", "ai_analysis_user")
+        query = request.query
+        max_papers = request.max_papers
+        user_id = request.user_id
 
         if not query:
             return {"error": "Query is required"}
 
         # Search for papers
-        aggregator = PaperSearchAggregator()
+        aggregator = app.state.aggregator
         papers = await aggregator.search_all_sources(
             query=query,
             sources=[PaperSource.ARXIV, PaperSource.PUBMED, PaperSource.GOOGLE_SCHOLAR],
@@ -473,7 +551,7 @@ async def analyze_papers_with_ai(request: dict):
             return {"error": "No papers found for the given query", "query": query}
 
         # Analyze papers using Vertex AI
-        vertex_ai = VertexAIService()
+        vertex_ai = _get_vertex_ai_service()
         analyses = await vertex_ai.analyze_papers_batch(papers)
 
         # Combine papers with analyses
@@ -487,7 +565,7 @@ async def analyze_papers_with_ai(request: dict):
                     "id": paper.id,
                     "title": paper.title,
                     "authors": paper.authors,
-                    "abstract": paper.abstract[:300] + "..." if len(paper.abstract) > 300 else paper.abstract,
+                    "abstract": _truncate(paper.abstract, 300),
                     "published": paper.published,
                     "source": str(paper.source),
                     "venue": paper.venue,
@@ -521,20 +599,25 @@ async def analyze_papers_with_ai(request: dict):
         logger.error(f"AI paper analysis error: {e}")
         return {"error": str(e), "query": query}
 
-# Error handlers
+# Error handlers (constant bodies are serialized once)
+_NOT_FOUND_BODY = b'{"detail":"Endpoint not found"}'
+_SERVER_ERROR_BODY = b'{"detail":"Internal server error"}'
+
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return Response(
+        content=_NOT_FOUND_BODY,
         status_code=404,
-        content={"detail": "Endpoint not found"}
+        media_type="application/json"
     )
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     logger.error(f"Internal server error: {exc}")
-    return JSONResponse(
+    return Response(
+        content=_SERVER_ERROR_BODY,
         status_code=500,
-        content={"detail": "Internal server error"}
+        media_type="application/json"
     )
 
 # Run with: uvicorn app.main_full:app --reload
\ No newline at end of file
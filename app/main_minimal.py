@@ -3,13 +3,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,9 +14,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
+    # Records are written by a background listener thread until teardown
+    teardown_logging = setup_logging(logging.INFO)
     logger.info("Starting up Research Paper API (Minimal)...")
     yield
     logger.info("Shutting down...")
+    teardown_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -37,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.cors_max_age,
 )
 
 @app.get("/")
@@ -0,0 +1,36 @@
+# app/models/analysis.py
+from pydantic import BaseModel, Field
+
+class ResearchGapsRequest(BaseModel):
+    """Request model for research gap analysis"""
+    query: str = Field(default="", description="Search query")
+    research_domain: str = Field(default="", description="Research domain for context")
+    max_papers: int = Field(default=10, description="Maximum number of papers to analyze")
+    user_id: str = Field(default="research_gaps_user", description="User making the request")
+
+class ResearchScopeRequest(BaseModel):
+    """Request model for research scope generation"""
+    query: str = Field(default="", description="Search query")
+    research_question: str = Field(default="", description="Research question to scope")
+    timeline_months: int = Field(default=12, description="Project timeline in months")
+    max_papers: int = Field(default=10, description="Maximum number of papers to analyze")
+    user_id: str = Field(default="research_scope_user", description="User making the request")
+
+class ComprehensiveReportRequest(BaseModel):
+    """Request model for the comprehensive PDF report"""
+    query: str = Field(default="", description="Search query")
+    research_question: str = Field(default="", description="Research question to scope")
+    research_domain: str = Field(default="", description="Research domain for context")
+    max_papers: int = Field(default=8, description="Maximum number of papers to include")
+    timeline_months: int = Field(default=12, description="Project timeline in months")
+    report_title: str = Field(default="Comprehensive Research Analysis Report", description="Report title")
+    user_id: str = Field(default="report_user", description="User making the request")
+    include_analysis: bool = Field(default=True, description="Include per-paper AI analysis")
+    include_gaps: bool = Field(default=True, description="Include research gap analysis")
+    include_scope: bool = Field(default=True, description="Include research scope")
+
+class PaperAnalysisRequest(BaseModel):
+    """Request model for AI analysis of search results"""
+    query: str = Field(default="", description="Search query")
+    max_papers: int = Field(default=5, description="Maximum number of papers to analyze")
+    user_id: str = Field(default="ai_analysis_user", description="User making the request")
@@ -1,9 +1,13 @@
 # app/models/chat.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+def utc_now() -> datetime:
+    """Timezone-aware current UTC time (replaces the deprecated datetime.utcnow)"""
+    return datetime.now(timezone.utc)
+
 class MessageRole(str, Enum):
     """Message role in chat"""
     USER = "user"
@@ -12,17 +16,16 @@ class MessageRole(str, Enum):
 
 class ChatMessage(BaseModel):
     """Individual chat message"""
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
     message_id: str = Field(..., description="Unique message identifier")
     session_id: str = Field(..., description="Session this message belongs to")
     role: MessageRole = Field(..., description="Message role")
     content: str = Field(..., description="Message content")
     papers_context: List[str] = Field(default_factory=list, description="Paper IDs referenced in context")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Message timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Message timestamp")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
-    class Config:
-        use_enum_values = True
-
 class ChatRequest(BaseModel):
     """Request to send a chat message"""
     message: str = Field(..., min_length=1, max_length=2000, description="User message")
@@ -30,6 +33,8 @@ class ChatRequest(BaseModel):
 
 class ChatResponse(BaseModel):
     """Response from chat"""
+    model_config = ConfigDict(frozen=True)
+
     message_id: str = Field(..., description="Message identifier")
     response: str = Field(..., description="Assistant response")
     papers_referenced: List[str] = Field(default_factory=list, description="Papers referenced in response")
@@ -46,7 +51,7 @@ class ChatSession(BaseModel):
     session_id: str = Field(..., description="Session identifier")
     user_id: str = Field(..., description="User who owns the session")
     title: Optional[str] = Field(None, description="Session title")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Session creation time")
-    last_activity: datetime = Field(default_factory=datetime.utcnow, description="Last activity timestamp")
+    created_at: datetime = Field(default_factory=utc_now, description="Session creation time")
+    last_activity: datetime = Field(default_factory=utc_now, description="Last activity timestamp")
     message_count: int = Field(default=0, description="Number of messages in session")
     papers_available: List[str] = Field(default_factory=list, description="Papers available for context")
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/paper.py
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -19,6 +19,8 @@ class SortBy(str, Enum):
 
 class Paper(BaseModel):
     """Core paper model"""
+    model_config = ConfigDict(use_enum_values=True, extra='forbid')
+
     id: str = Field(..., description="Unique paper identifier")
     title: str = Field(..., description="Paper title")
     abstract: str = Field(..., description="Paper abstract/summary")
@@ -30,12 +32,12 @@ class Paper(BaseModel):
     citation_count: Optional[int] = Field(None, description="Number of citations")
     venue: Optional[str] = Field(None, description="Publication venue")
     keywords: List[str] = Field(default_factory=list, description="Paper keywords")
-
-    class Config:
-        use_enum_values = True
+    is_open_access: bool = Field(False, description="Whether the full text is freely available")
 
 class PaperAnalysis(BaseModel):
     """AI-generated paper analysis"""
+    model_config = ConfigDict(extra='forbid')
+
     paper_id: str = Field(..., description="Reference to paper")
     summary: str = Field(..., description="AI-generated summary")
     strengths: List[str] = Field(default_factory=list, description="Paper strengths")
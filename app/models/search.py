@@ -1,5 +1,5 @@
 # app/models/search.py
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from enum import Enum
@@ -17,9 +17,11 @@ class DateRange(BaseModel):
     start: Optional[date] = Field(None, description="Start date (YYYY-MM-DD)")
     end: Optional[date] = Field(None, description="End date (YYYY-MM-DD)")
 
-    @validator('end')
-    def end_after_start(cls, v, values):
-        if v and values.get('start') and v < values['start']:
+    @field_validator('end')
+    @classmethod
+    def end_after_start(cls, v, info: ValidationInfo):
+        start = info.data.get('start')
+        if v and start and v < start:
             raise ValueError('End date must be after start date')
         return v
 
@@ -28,7 +30,8 @@ class PaperSearchRequest(BaseModel):
     query: str = Field(..., min_length=3, max_length=500, description="Search query")
     sources: List[PaperSource] = Field(
         default=[PaperSource.ARXIV, PaperSource.GOOGLE_SCHOLAR],
-        description="Sources to search"
+        min_length=1,
+        description="Sources to search (at least one)"
     )
     max_results: int = Field(
         default=20,
@@ -40,14 +43,10 @@ class PaperSearchRequest(BaseModel):
     date_range: Optional[DateRange] = Field(None, description="Publication date range")
     generate_analysis: bool = Field(default=True, description="Whether to generate AI analysis")
 
-    @validator('sources')
-    def sources_not_empty(cls, v):
-        if not v:
-            raise ValueError('At least one source must be specified')
-        return v
-
 class SearchSession(BaseModel):
     """Search session model"""
+    model_config = ConfigDict(use_enum_values=True)
+
     session_id: str = Field(..., description="Unique session identifier")
     user_id: str = Field(..., description="User who created the session")
     query: str = Field(..., description="Search query")
@@ -62,9 +61,6 @@ class SearchSession(BaseModel):
     completed_at: Optional[datetime] = Field(None, description="Completion timestamp")
     gcs_pdf_path: Optional[str] = Field(None, description="Path to generated PDF in GCS")
 
-    class Config:
-        use_enum_values = True
-
 class SearchResponse(BaseModel):
     """Response model for paper search"""
     session_id: str = Field(..., description="Session identifier")
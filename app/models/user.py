@@ -1,5 +1,5 @@
 # app/models/user.py
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -20,6 +20,8 @@ class ApiUsage(BaseModel):
 
 class ResearchProfile(BaseModel):
     """User's research profile"""
+    model_config = ConfigDict(use_enum_values=True)
+
     subscription_tier: SubscriptionTier = Field(default=SubscriptionTier.FREE, description="Subscription level")
     api_usage: ApiUsage = Field(default_factory=ApiUsage, description="API usage statistics")
     research_interests: List[str] = Field(default_factory=list, description="Research areas of interest")
@@ -27,13 +29,14 @@ class ResearchProfile(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Profile creation date")
     updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
 
-    class Config:
-        use_enum_values = True
-
 class UserProfile(BaseModel):
     """Complete user profile"""
     user_id: str = Field(..., description="Unique user identifier")
-    email: Optional[EmailStr] = Field(None, description="User email")
+    email: Optional[str] = Field(
+        None,
+        pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
+        description="User email"
+    )
     display_name: Optional[str] = Field(None, description="Display name")
     research_profile: ResearchProfile = Field(default_factory=ResearchProfile, description="Research-specific profile")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Account creation date")
@@ -0,0 +1,101 @@
+# app/services/llm/cache.py
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+LLM_CACHE_MAX_ENTRIES = 4096
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Near-duplicate inputs (cosine similarity at or above the threshold) share a response
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_MAX_ENTRIES = 1024
+
+class LLMResponseCache:
+    """In-process LRU cache of model response text, keyed by model, prompt and sampling settings"""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, **params: Any) -> str:
+        """SHA-256 over everything that shapes the response"""
+        payload = orjson.dumps({"model": model, "prompt": prompt, **params}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, text: str):
+        """Store response text, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, text)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+class SemanticResponseCache:
+    """
+    Response text keyed by input embedding, matched by cosine similarity.
+    Embeddings live in one preallocated matrix, so a lookup is a single matrix-vector product;
+    when full, the oldest entry is overwritten.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._vectors: Optional[np.ndarray] = None  # Allocated once the embedding size is known
+        self._expires = np.zeros(max_entries)
+        self._texts: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def get(self, embedding: Sequence[float]) -> Optional[str]:
+        """Return the text of the most similar unexpired entry above the threshold"""
+        vector = self._normalize(embedding)
+        if vector is None or self._size == 0 or vector.shape[0] != self._vectors.shape[1]:
+            return None
+        scores = self._vectors[:self._size] @ vector
+        scores[self._expires[:self._size] <= time.monotonic()] = -1.0
+        best = int(np.argmax(scores))
+        return self._texts[best] if scores[best] >= self.threshold else None
+
+    def set(self, embedding: Sequence[float], text: str):
+        """Store response text under an input embedding"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._vectors.shape[1]:
+            return
+        slot = self._next
+        self._vectors[slot] = vector
+        self._expires[slot] = time.monotonic() + self.ttl_seconds
+        self._texts[slot] = text
+        self._next = (slot + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
@@ -1,19 +1,207 @@
 # app/services/llm/vertex_ai.py
 import asyncio
+import html
 import logging
-import json
+import orjson
 import os
+import random
+import re
+import tempfile
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, BinaryIO, Iterator, List, Dict, Any, NamedTuple, Optional
 
+import httpx
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 
 from app.core.config import settings
 from app.models.paper import Paper, PaperAnalysis
+from app.services.llm.cache import LLMResponseCache, SemanticResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Rendered reports stay in memory up to this size, then spill to a temp file
+PDF_SPOOL_MAX_SIZE = 1 << 20
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Per-call timeout, and retries (exponential backoff with jitter) for rate limits and 5xx errors
+GENERATE_TIMEOUT_SECONDS = 45
+GENERATE_MAX_ATTEMPTS = 3
+GENERATE_MAX_BACKOFF_SECONDS = 10
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# identify_research_gaps sends up to GAPS_SINGLE_CALL_LIMIT papers in one prompt; larger sets
+# are analyzed in concurrent chunks and the partial analyses are merged by one more call
+GAPS_SINGLE_CALL_LIMIT = 10
+GAPS_CHUNK_SIZE = 5
+GAPS_MAX_PAPERS = 50
+RESEARCH_GAPS_LIST_FIELDS = (
+    "current_trends",
+    "research_gaps",
+    "methodology_gaps",
+    "future_opportunities",
+    "cross_domain_connections",
+    "recommendations",
+)
+
+# Papers with shorter abstracts are not sent to the model (too little to analyze)
+MIN_ABSTRACT_LENGTH = 50
+
+# Markdown code fence wrapped around a JSON response (opening ```/```json and closing ```)
+JSON_FENCE_RE = re.compile(r"\A```(?:json)?\s*|\s*```\Z")
+
+# Embeds paper text for the semantic (near-duplicate) analysis cache
+EMBEDDING_MODEL = "text-embedding-004"
+
+# Prompt templates, filled with str.format (literal JSON braces are doubled)
+ANALYSIS_PROMPT = """
+Analyze this research paper comprehensively:
+
+Title: {title}
+Authors: {authors}
+Abstract: {abstract}
+Publication Date: {published}
+Source: {source}
+Venue: {venue}
+
+Please provide a detailed analysis covering:
+
+1. **Summary**: A concise 2-3 sentence summary of the paper's main contribution
+2. **Key Contributions**: List 3-5 specific contributions this paper makes to the field
+3. **Strengths**: Identify 3-4 strong points of this research
+4. **Weaknesses**: Point out 2-3 potential limitations or areas for improvement
+5. **Research Gaps**: Identify 2-3 gaps or future research directions this paper reveals
+6. **Future Scope**: Suggest 3-4 potential research directions building on this work
+7. **Methodology**: Describe the research methodology used (if apparent from abstract)
+8. **Main Findings**: List 3-4 key findings or results
+
+Format your response as valid JSON with the following structure:
+{{
+    "summary": "...",
+    "key_contributions": ["...", "...", "..."],
+    "strengths": ["...", "...", "..."],
+    "weaknesses": ["...", "...", "..."],
+    "research_gaps": ["...", "...", "..."],
+    "future_scope": ["...", "...", "..."],
+    "methodology": "...",
+    "main_findings": ["...", "...", "..."]
+}}
+"""
+
+RESEARCH_GAPS_PROMPT = """
+Analyze these research papers in the domain of "{domain}" and identify research gaps:
+
+{papers_text}
+
+Based on these papers, identify:
+1. **Current Research Trends**: What are the main themes and approaches?
+2. **Research Gaps**: What important questions remain unanswered?
+3. **Methodology Gaps**: What research methods are underutilized?
+4. **Future Opportunities**: What are the most promising research directions?
+5. **Cross-Domain Connections**: How could this research connect with other fields?
+
+Provide a comprehensive analysis in JSON format:
+{{
+    "domain": "{domain_title}",
+    "current_trends": ["...", "...", "..."],
+    "research_gaps": [
+        {{"gap": "...", "description": "...", "importance": "high/medium/low"}},
+        {{"gap": "...", "description": "...", "importance": "high/medium/low"}}
+    ],
+    "methodology_gaps": ["...", "...", "..."],
+    "future_opportunities": [
+        {{"opportunity": "...", "description": "...", "feasibility": "high/medium/low"}},
+        {{"opportunity": "...", "description": "...", "feasibility": "high/medium/low"}}
+    ],
+    "cross_domain_connections": ["...", "...", "..."],
+    "recommendations": ["...", "...", "..."]
+}}
+"""
+
+RESEARCH_SCOPE_PROMPT = """
+Create a comprehensive research scope and plan based on:
+
+Research Question: "{research_question}"
+Timeline: {timeline_months} months
+Related Papers:
+{papers_text}
+
+Generate a detailed research plan in JSON format:
+{{
+    "research_question": "{research_question}",
+    "timeline_months": {timeline_months},
+    "research_objectives": [
+        {{"objective": "...", "description": "...", "priority": "high/medium/low"}},
+        {{"objective": "...", "description": "...", "priority": "high/medium/low"}}
+    ],
+    "methodology": {{
+        "approach": "...",
+        "data_collection": ["...", "...", "..."],
+        "analysis_methods": ["...", "...", "..."],
+        "tools_required": ["...", "...", "..."]
+    }},
+    "phases": [
+        {{
+            "phase": "Phase 1: Literature Review",
+            "duration_months": 2,
+            "activities": ["...", "...", "..."],
+            "deliverables": ["...", "..."]
+        }},
+        {{
+            "phase": "Phase 2: ...",
+            "duration_months": 3,
+            "activities": ["...", "...", "..."],
+            "deliverables": ["...", "..."]
+        }}
+    ],
+    "expected_challenges": [
+        {{"challenge": "...", "mitigation": "...", "risk_level": "high/medium/low"}},
+        {{"challenge": "...", "mitigation": "...", "risk_level": "high/medium/low"}}
+    ],
+    "resources_needed": {{
+        "personnel": ["...", "...", "..."],
+        "equipment": ["...", "...", "..."],
+        "software": ["...", "...", "..."],
+        "estimated_budget": "..."
+    }},
+    "success_metrics": ["...", "...", "..."],
+    "potential_outcomes": ["...", "...", "..."]
+}}
+"""
+
+def _has_abstract(paper: Paper) -> bool:
+    """Whether the paper has enough abstract text to be worth a model call"""
+    return len(paper.abstract.strip()) >= MIN_ABSTRACT_LENGTH
+
+def _papers_with_abstracts(papers: List[Paper], limit: Optional[int] = None) -> List[Paper]:
+    """Up to limit papers that have usable abstracts, logging how many were skipped"""
+    usable = [paper for paper in papers if _has_abstract(paper)]
+    skipped = len(papers) - len(usable)
+    if skipped:
+        logger.info(f"Skipping {skipped} papers without usable abstracts")
+    return usable[:limit]
+
+RESEARCH_GAPS_MERGE_PROMPT = """
+The following JSON list contains research gap analyses of different subsets of papers in the domain of "{domain}":
+
+{partials_json}
+
+Consolidate them into one analysis of the whole set: merge duplicate or overlapping points,
+keep the most important gaps and opportunities, and preserve the importance and feasibility ratings.
+
+Respond with a single valid JSON object in exactly the same structure as each analysis above,
+with "domain" set to "{domain_title}".
+"""
+
+class _JsonResponse(NamedTuple):
+    """Fence-stripped model output plus what is needed to cache it once it parses"""
+    text: str
+    cache_key: str
+    embedding: Optional[List[float]]
+
 class VertexAIService:
     """Google Vertex AI service using the new GenAI client library"""
 
@@ -27,8 +215,18 @@ class VertexAIService:
 
         # Initialize the new GenAI client
         try:
+            # One pooled async HTTP client for every call; keep-alive connections sized
+            # to the concurrency limit so requests never wait on a fresh TLS handshake
             self.client = genai.Client(
                 api_key=self.api_key,
+                http_options=types.HttpOptions(
+                    async_client_args={
+                        "limits": httpx.Limits(
+                            max_connections=settings.vertex_ai_concurrency * 2,
+                            max_keepalive_connections=settings.vertex_ai_concurrency
+                        )
+                    }
+                )
             )
             logger.info(f"GenAI client initialized for project {self.project_id}")
         except Exception as e:
@@ -39,6 +237,115 @@ class VertexAIService:
         self.model_name = "gemini-2.0-flash-exp"
         self.chat_model = "gemini-2.0-flash-exp"
 
+        # Caps concurrent model calls across all methods (replaces fixed-size batches)
+        self._semaphore = asyncio.Semaphore(settings.vertex_ai_concurrency)
+
+        # Structured (JSON) responses for identical prompts are reused, and paper
+        # analyses are also reused for near-duplicate papers
+        self._response_cache = LLMResponseCache()
+        self._semantic_cache = SemanticResponseCache()
+
+        # PDF report styles, built once and shared (read-only) by every render
+        self._styles = getSampleStyleSheet()
+        self._title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self._styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=1  # Center alignment
+        )
+
+    async def close(self):
+        """Close the pooled async HTTP connections"""
+        try:
+            await self.client.aio.aclose()
+        except Exception as e:
+            logger.error(f"Error closing GenAI client: {e}")
+
+    async def _generate_content(self, **kwargs):
+        """
+        Call the model through the SDK's native async client, so concurrent
+        requests share its pooled HTTP connections instead of worker threads.
+        Each attempt times out after GENERATE_TIMEOUT_SECONDS; rate-limit and
+        server errors are retried with backoff.
+        """
+        for attempt in range(1, GENERATE_MAX_ATTEMPTS + 1):
+            try:
+                async with self._semaphore:
+                    return await asyncio.wait_for(
+                        self.client.aio.models.generate_content(**kwargs),
+                        timeout=GENERATE_TIMEOUT_SECONDS
+                    )
+            except errors.APIError as e:
+                if e.code not in RETRYABLE_STATUS_CODES or attempt == GENERATE_MAX_ATTEMPTS:
+                    raise
+                # Back off outside the semaphore so other calls can use the slot
+                delay = min(GENERATE_MAX_BACKOFF_SECONDS, 2 ** (attempt - 1)) + random.uniform(0, 1)
+                logger.warning(f"Gemini call failed with {e.code}, retrying in {delay:.1f}s (attempt {attempt}/{GENERATE_MAX_ATTEMPTS})")
+                await asyncio.sleep(delay)
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for the semantic cache; None if the embedding call fails"""
+        try:
+            async with self._semaphore:
+                response = await self.client.aio.models.embed_content(model=EMBEDDING_MODEL, contents=text)
+            return response.embeddings[0].values
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+            return None
+
+    async def _generate_json_text(
+        self,
+        prompt: str,
+        config: types.GenerateContentConfig,
+        similarity_text: Optional[str] = None
+    ) -> _JsonResponse:
+        """
+        Generate fence-stripped JSON text for a prompt, reusing cached responses.
+        With similarity_text, an exact-cache miss also checks the semantic cache.
+        Callers pass the result to _cache_json_response once it parses,
+        so malformed responses are never reused.
+        """
+        cache_key = LLMResponseCache.make_key(
+            self.model_name,
+            prompt,
+            temperature=config.temperature,
+            top_p=config.top_p,
+            max_output_tokens=config.max_output_tokens
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return _JsonResponse(cached, cache_key, None)
+
+        embedding = await self._embed(similarity_text) if similarity_text else None
+        if embedding is not None:
+            cached = self._semantic_cache.get(embedding)
+            if cached is not None:
+                return _JsonResponse(cached, cache_key, None)
+
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part(text=prompt)]
+            )
+        ]
+        response = await self._generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=config
+        )
+
+        # Clean up the response to ensure it's valid JSON
+        response_text = JSON_FENCE_RE.sub('', response.text.strip())
+
+        return _JsonResponse(response_text, cache_key, embedding)
+
+    def _cache_json_response(self, response: _JsonResponse):
+        """Remember a response that parsed successfully"""
+        self._response_cache.set(response.cache_key, response.text)
+        if response.embedding is not None:
+            self._semantic_cache.set(response.embedding, response.text)
+
     async def chat_with_paper(
         self,
         message: str,
@@ -127,7 +434,7 @@ Please provide a detailed and specific response to the current question, conside
             )
 
             # Make the API call
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=self.chat_model,
                 contents=contents,
                 config=config
@@ -195,7 +502,7 @@ Provide comparative analysis and insights based on the papers' content.
                 max_output_tokens=2048
             )
 
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=self.chat_model,
                 contents=contents,
                 config=config
@@ -210,52 +517,36 @@ Provide comparative analysis and insights based on the papers' content.
             logger.error(f"Error in chat_with_papers: {e}")
             return f"I encountered an error: {str(e)}. Please try again."
 
-    async def analyze_paper(self, paper: Paper) -> PaperAnalysis:
+    async def analyze_paper(self, paper: Paper, generated_at: Optional[datetime] = None) -> PaperAnalysis:
         """
-        Generate comprehensive analysis of a research paper
+        Generate comprehensive analysis of a research paper.
+        Batches pass one generated_at so every analysis in the batch shares it.
         """
-        try:
-            prompt = f"""
-            Analyze this research paper comprehensively:
-
-            Title: {paper.title}
-            Authors: {', '.join(paper.authors)}
-            Abstract: {paper.abstract}
-            Publication Date: {paper.published}
-            Source: {paper.source}
-            Venue: {paper.venue or 'Not specified'}
-
-            Please provide a detailed analysis covering:
-
-            1. **Summary**: A concise 2-3 sentence summary of the paper's main contribution
-            2. **Key Contributions**: List 3-5 specific contributions this paper makes to the field
-            3. **Strengths**: Identify 3-4 strong points of this research
-            4. **Weaknesses**: Point out 2-3 potential limitations or areas for improvement
-            5. **Research Gaps**: Identify 2-3 gaps or future research directions this paper reveals
-            6. **Future Scope**: Suggest 3-4 potential research directions building on this work
-            7. **Methodology**: Describe the research methodology used (if apparent from abstract)
-            8. **Main Findings**: List 3-4 key findings or results
-
-            Format your response as valid JSON with the following structure:
-            {{
-                "summary": "...",
-                "key_contributions": ["...", "...", "..."],
-                "strengths": ["...", "...", "..."],
-                "weaknesses": ["...", "...", "..."],
-                "research_gaps": ["...", "...", "..."],
-                "future_scope": ["...", "...", "..."],
-                "methodology": "...",
-                "main_findings": ["...", "...", "..."]
-            }}
-            """
+        generated_at = generated_at or datetime.now()
 
-            # Use the new GenAI client
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part(text=prompt)]
-                )
-            ]
+        if not _has_abstract(paper):
+            return PaperAnalysis(
+                paper_id=paper.id,
+                summary="Insufficient abstract for analysis",
+                key_contributions=[],
+                strengths=[],
+                weaknesses=[],
+                research_gaps=[],
+                future_scope=[],
+                methodology="",
+                main_findings=[],
+                generated_at=generated_at
+            )
+
+        try:
+            prompt = ANALYSIS_PROMPT.format(
+                title=paper.title,
+                authors=', '.join(paper.authors),
+                abstract=paper.abstract,
+                published=paper.published,
+                source=paper.source,
+                venue=paper.venue or 'Not specified'
+            )
 
             config = types.GenerateContentConfig(
                 temperature=0.3,
@@ -281,22 +572,18 @@ Provide comparative analysis and insights based on the papers' content.
                 ]
             )
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=contents,
-                config=config
+            response = await self._generate_json_text(
+                prompt,
+                config,
+                similarity_text=f"{paper.title}\n{paper.abstract[:1000]}"
             )
+            response_text = response.text
 
             # Parse the response
-            response_text = response.text.strip()
-
-            # Clean up the response to ensure it's valid JSON
-            if response_text.startswith('```json'):
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
-
             try:
-                analysis_data = json.loads(response_text)
-            except json.JSONDecodeError:
+                analysis_data = orjson.loads(response_text)
+                self._cache_json_response(response)
+            except orjson.JSONDecodeError:
                 # Fallback if JSON parsing fails
                 logger.warning(f"Failed to parse JSON response for paper {paper.id}")
                 analysis_data = {
@@ -320,7 +607,7 @@ Provide comparative analysis and insights based on the papers' content.
                 future_scope=analysis_data.get("future_scope", []),
                 methodology=analysis_data.get("methodology", ""),
                 main_findings=analysis_data.get("main_findings", []),
-                generated_at=datetime.now()
+                generated_at=generated_at
             )
 
         except Exception as e:
@@ -336,7 +623,7 @@ Provide comparative analysis and insights based on the papers' content.
                 future_scope=[],
                 methodology="",
                 main_findings=[],
-                generated_at=datetime.now()
+                generated_at=generated_at
             )
 
     async def analyze_papers_batch(self, papers: List[Paper]) -> List[PaperAnalysis]:
@@ -345,110 +632,81 @@ Provide comparative analysis and insights based on the papers' content.
         """
         logger.info(f"Starting batch analysis of {len(papers)} papers")
 
-        # Process papers concurrently (but with some rate limiting)
-        batch_size = 3  # Process 3 papers at a time to avoid overwhelming the API
-        results = []
-
-        for i in range(0, len(papers), batch_size):
-            batch = papers[i:i + batch_size]
-            batch_tasks = [self.analyze_paper(paper) for paper in batch]
-
-            try:
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Error in batch analysis: {result}")
-                        # Create a failed analysis for this paper
-                        failed_analysis = PaperAnalysis(
-                            paper_id="unknown",
-                            summary=f"Batch analysis failed: {str(result)}",
-                            key_contributions=[],
-                            strengths=[],
-                            weaknesses=[],
-                            research_gaps=[],
-                            future_scope=[],
-                            methodology="",
-                            main_findings=[],
-                            generated_at=datetime.now()
-                        )
-                        results.append(failed_analysis)
-                    else:
-                        results.append(result)
-
-            except Exception as e:
-                logger.error(f"Error in batch processing: {e}")
-                # Add failed analyses for this batch
-                for paper in batch:
-                    failed_analysis = PaperAnalysis(
-                        paper_id=paper.id,
-                        summary=f"Batch processing failed: {str(e)}",
-                        key_contributions=[],
-                        strengths=[],
-                        weaknesses=[],
-                        research_gaps=[],
-                        future_scope=[],
-                        methodology="",
-                        main_findings=[],
-                        generated_at=datetime.now()
-                    )
-                    results.append(failed_analysis)
-
-            # Small delay between batches to be respectful to the API
-            if i + batch_size < len(papers):
-                await asyncio.sleep(1)
+        # Dispatch every paper at once; the service semaphore keeps at most
+        # vertex_ai_concurrency calls in flight, so a slow paper never stalls the rest.
+        # analyze_paper turns its own errors into failed analyses, so results line up with papers
+        generated_at = datetime.now()
+        results = await asyncio.gather(*(self.analyze_paper(paper, generated_at) for paper in papers))
 
         logger.info(f"Completed {len(results)} analyses out of {len(papers)} papers")
         return results
 
+    async def analyze_papers_stream(self, papers: List[Paper]) -> AsyncIterator[PaperAnalysis]:
+        """
+        Yield analyses in completion order, each as soon as its model call returns.
+        Use analyze_papers_batch when results must line up with papers.
+        """
+        generated_at = datetime.now()
+        tasks = [asyncio.create_task(self.analyze_paper(paper, generated_at)) for paper in papers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer may stop early; don't leave model calls running
+            for task in tasks:
+                task.cancel()
+
     async def identify_research_gaps(self, papers: List[Paper], research_domain: str = "") -> Dict[str, Any]:
         """
-        Identify research gaps across multiple papers
+        Identify research gaps across multiple papers.
+        Small sets take one model call; larger sets are analyzed in concurrent
+        chunks (map) and the partial analyses merged by a final call (reduce).
+        """
+        usable = _papers_with_abstracts(papers, GAPS_MAX_PAPERS)
+        if not usable:
+            logger.warning("No papers with abstracts to identify research gaps from")
+            return {
+                "domain": research_domain or "General Research",
+                "error": "No papers with abstracts to analyze",
+                "current_trends": [],
+                "research_gaps": [],
+                "methodology_gaps": [],
+                "future_opportunities": [],
+                "cross_domain_connections": [],
+                "recommendations": []
+            }
+        if len(usable) <= GAPS_SINGLE_CALL_LIMIT:
+            return await self._research_gaps_for_papers(usable, research_domain)
+
+        chunks = [usable[i:i + GAPS_CHUNK_SIZE] for i in range(0, len(usable), GAPS_CHUNK_SIZE)]
+        results = await asyncio.gather(
+            *(self._research_gaps_for_papers(chunk, research_domain) for chunk in chunks)
+        )
+        partials = [result for result in results if "error" not in result]
+        if not partials:
+            return results[0]
+        if len(partials) == 1:
+            return partials[0]
+
+        return await self._merge_research_gaps(partials, research_domain)
+
+    async def _research_gaps_for_papers(self, papers: List[Paper], research_domain: str) -> Dict[str, Any]:
+        """
+        Identify research gaps for one prompt's worth of papers
         """
         try:
             paper_summaries = []
-            for paper in papers[:10]:  # Limit to 10 papers for analysis
+            for paper in papers:
                 summary = f"Title: {paper.title}\nAbstract: {paper.abstract[:500]}..."
                 paper_summaries.append(summary)
 
             papers_text = "\n\n".join(paper_summaries)
 
-            prompt = f"""
-            Analyze these research papers in the domain of "{research_domain or 'general research'}" and identify research gaps:
-
-            {papers_text}
-
-            Based on these papers, identify:
-            1. **Current Research Trends**: What are the main themes and approaches?
-            2. **Research Gaps**: What important questions remain unanswered?
-            3. **Methodology Gaps**: What research methods are underutilized?
-            4. **Future Opportunities**: What are the most promising research directions?
-            5. **Cross-Domain Connections**: How could this research connect with other fields?
-
-            Provide a comprehensive analysis in JSON format:
-            {{
-                "domain": "{research_domain or 'General Research'}",
-                "current_trends": ["...", "...", "..."],
-                "research_gaps": [
-                    {{"gap": "...", "description": "...", "importance": "high/medium/low"}},
-                    {{"gap": "...", "description": "...", "importance": "high/medium/low"}}
-                ],
-                "methodology_gaps": ["...", "...", "..."],
-                "future_opportunities": [
-                    {{"opportunity": "...", "description": "...", "feasibility": "high/medium/low"}},
-                    {{"opportunity": "...", "description": "...", "feasibility": "high/medium/low"}}
-                ],
-                "cross_domain_connections": ["...", "...", "..."],
-                "recommendations": ["...", "...", "..."]
-            }}
-            """
-
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part(text=prompt)]
-                )
-            ]
+            prompt = RESEARCH_GAPS_PROMPT.format(
+                domain=research_domain or 'general research',
+                domain_title=research_domain or 'General Research',
+                papers_text=papers_text
+            )
 
             config = types.GenerateContentConfig(
                 temperature=0.4,
@@ -456,23 +714,18 @@ Provide comparative analysis and insights based on the papers' content.
                 max_output_tokens=4096
             )
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=contents,
-                config=config
-            )
-
-            response_text = response.text.strip()
-
-            if response_text.startswith('```json'):
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
+            response = await self._generate_json_text(prompt, config)
+            response_text = response.text
 
             try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
+                result = orjson.loads(response_text)
+                self._cache_json_response(response)
+                return result
+            except orjson.JSONDecodeError:
                 logger.warning("Failed to parse research gaps JSON response")
                 return {
                     "domain": research_domain or "General Research",
+                    "error": "Failed to parse structured response",
                     "current_trends": ["Analysis available in raw text"],
                     "research_gaps": [{"gap": "Analysis failed", "description": response_text[:500], "importance": "unknown"}],
                     "methodology_gaps": [],
@@ -494,75 +747,69 @@ Provide comparative analysis and insights based on the papers' content.
                 "recommendations": []
             }
 
+    async def _merge_research_gaps(self, partials: List[Dict[str, Any]], research_domain: str) -> Dict[str, Any]:
+        """
+        Consolidate per-chunk research gap analyses with one model call,
+        falling back to concatenating them if the merge fails
+        """
+        try:
+            prompt = RESEARCH_GAPS_MERGE_PROMPT.format(
+                domain=research_domain or 'general research',
+                domain_title=research_domain or 'General Research',
+                partials_json=orjson.dumps(partials, option=orjson.OPT_INDENT_2).decode()
+            )
+
+            config = types.GenerateContentConfig(
+                temperature=0.2,
+                top_p=0.9,
+                max_output_tokens=4096
+            )
+
+            response = await self._generate_json_text(prompt, config)
+            result = orjson.loads(response.text)
+            self._cache_json_response(response)
+            return result
+
+        except Exception as e:
+            logger.warning(f"Failed to merge research gap analyses, concatenating instead: {e}")
+            merged = {"domain": research_domain or "General Research"}
+            for field in RESEARCH_GAPS_LIST_FIELDS:
+                merged[field] = [item for partial in partials for item in partial.get(field, [])]
+            return merged
+
     async def generate_research_scope(self, papers: List[Paper], research_question: str, timeline_months: int = 12) -> Dict[str, Any]:
         """
         Generate a research scope and plan based on papers and research question
         """
+        usable = _papers_with_abstracts(papers, 8)  # Limit to 8 papers for scope generation
+        if not usable:
+            logger.warning("No papers with abstracts to generate a research scope from")
+            return {
+                "research_question": research_question,
+                "timeline_months": timeline_months,
+                "error": "No papers with abstracts to analyze",
+                "research_objectives": [],
+                "methodology": {},
+                "phases": [],
+                "expected_challenges": [],
+                "resources_needed": {},
+                "success_metrics": [],
+                "potential_outcomes": []
+            }
+
         try:
             paper_summaries = []
-            for paper in papers[:8]:  # Limit to 8 papers for scope generation
+            for paper in usable:
                 summary = f"Title: {paper.title}\nAuthors: {', '.join(paper.authors)}\nAbstract: {paper.abstract[:400]}..."
                 paper_summaries.append(summary)
 
             papers_text = "\n\n".join(paper_summaries)
 
-            prompt = f"""
-            Create a comprehensive research scope and plan based on:
-
-            Research Question: "{research_question}"
-            Timeline: {timeline_months} months
-            Related Papers:
-            {papers_text}
-
-            Generate a detailed research plan in JSON format:
-            {{
-                "research_question": "{research_question}",
-                "timeline_months": {timeline_months},
-                "research_objectives": [
-                    {{"objective": "...", "description": "...", "priority": "high/medium/low"}},
-                    {{"objective": "...", "description": "...", "priority": "high/medium/low"}}
-                ],
-                "methodology": {{
-                    "approach": "...",
-                    "data_collection": ["...", "...", "..."],
-                    "analysis_methods": ["...", "...", "..."],
-                    "tools_required": ["...", "...", "..."]
-                }},
-                "phases": [
-                    {{
-                        "phase": "Phase 1: Literature Review",
-                        "duration_months": 2,
-                        "activities": ["...", "...", "..."],
-                        "deliverables": ["...", "..."]
-                    }},
-                    {{
-                        "phase": "Phase 2: ...",
-                        "duration_months": 3,
-                        "activities": ["...", "...", "..."],
-                        "deliverables": ["...", "..."]
-                    }}
-                ],
-                "expected_challenges": [
-                    {{"challenge": "...", "mitigation": "...", "risk_level": "high/medium/low"}},
-                    {{"challenge": "...", "mitigation": "...", "risk_level": "high/medium/low"}}
-                ],
-                "resources_needed": {{
-                    "personnel": ["...", "...", "..."],
-                    "equipment": ["...", "...", "..."],
-                    "software": ["...", "...", "..."],
-                    "estimated_budget": "..."
-                }},
-                "success_metrics": ["...", "...", "..."],
-                "potential_outcomes": ["...", "...", "..."]
-            }}
-            """
-
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part(text=prompt)]
-                )
-            ]
+            prompt = RESEARCH_SCOPE_PROMPT.format(
+                research_question=research_question,
+                timeline_months=timeline_months,
+                papers_text=papers_text
+            )
 
             config = types.GenerateContentConfig(
                 temperature=0.5,
@@ -570,20 +817,14 @@ Provide comparative analysis and insights based on the papers' content.
                 max_output_tokens=6000
             )
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=contents,
-                config=config
-            )
-
-            response_text = response.text.strip()
-
-            if response_text.startswith('```json'):
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
+            response = await self._generate_json_text(prompt, config)
+            response_text = response.text
 
             try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
+                result = orjson.loads(response_text)
+                self._cache_json_response(response)
+                return result
+            except orjson.JSONDecodeError:
                 logger.warning("Failed to parse research scope JSON response")
                 return {
                     "research_question": research_question,
@@ -614,38 +855,67 @@ Provide comparative analysis and insights based on the papers' content.
                 "potential_outcomes": []
             }
 
-    async def generate_comprehensive_report_pdf(
+    def render_comprehensive_report_pdf_sync(
         self,
         papers: List[Paper],
-        analyses: List[PaperAnalysis],
-        research_gaps: Dict[str, Any],
-        research_scope: Dict[str, Any],
+        analyses: Optional[List[PaperAnalysis]],
+        research_gaps: Optional[Dict[str, Any]],
+        research_scope: Optional[Dict[str, Any]],
         report_title: str = "Research Analysis Report"
-    ) -> bytes:
+    ) -> BinaryIO:
+        """
+        Render a comprehensive PDF report into a spooled temporary file.
+
+        The file stays in memory up to PDF_SPOOL_MAX_SIZE and spills to disk
+        beyond that; it is rewound and ready to read. ReportLab rendering is
+        CPU-bound and synchronous; call this from a worker thread (e.g.
+        run_in_threadpool) rather than the event loop.
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        self._write_comprehensive_report_pdf(
+            buffer, papers, analyses, research_gaps, research_scope, report_title
+        )
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def iter_pdf_chunks(pdf_file: BinaryIO, chunk_size: int = PDF_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield a rendered PDF in fixed-size chunks and close the file when done.
+
+        This is a sync generator on purpose: StreamingResponse iterates sync
+        iterators in its threadpool, so spooled disk reads don't block the loop.
+        """
+        try:
+            while chunk := pdf_file.read(chunk_size):
+                yield chunk
+        finally:
+            pdf_file.close()
+
+    @staticmethod
+    def _bullet_paragraph(items: List[str], style) -> Paragraph:
+        """One flowable for a whole bullet list; item text is escaped so ReportLab doesn't parse it as markup"""
+        return Paragraph("<br/>".join(f"• {html.escape(str(item))}" for item in items), style)
+
+    def _write_comprehensive_report_pdf(
+        self,
+        buffer: BinaryIO,
+        papers: List[Paper],
+        analyses: Optional[List[PaperAnalysis]],
+        research_gaps: Optional[Dict[str, Any]],
+        research_scope: Optional[Dict[str, Any]],
+        report_title: str
+    ):
         """
-        Generate a comprehensive PDF report
+        Write a comprehensive PDF report to a binary file-like object
         """
+        analyses = analyses or []
+        research_gaps = research_gaps or {}
         try:
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.lib import colors
-            from io import BytesIO
-            import textwrap
-
-            buffer = BytesIO()
             doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
 
-            # Define styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
+            styles = self._styles
+            title_style = self._title_style
 
             story = []
 
@@ -695,14 +965,12 @@ Provide comparative analysis and insights based on the papers' content.
 
                 if analysis.key_contributions:
                     story.append(Paragraph("Key Contributions:", styles['Heading3']))
-                    for contrib in analysis.key_contributions:
-                        story.append(Paragraph(f"• {contrib}", styles['Normal']))
+                    story.append(self._bullet_paragraph(analysis.key_contributions, styles['Normal']))
                     story.append(Spacer(1, 8))
 
                 if analysis.strengths:
                     story.append(Paragraph("Strengths:", styles['Heading3']))
-                    for strength in analysis.strengths:
-                        story.append(Paragraph(f"• {strength}", styles['Normal']))
+                    story.append(self._bullet_paragraph(analysis.strengths, styles['Normal']))
                     story.append(Spacer(1, 8))
 
                 story.append(Spacer(1, 15))
@@ -715,17 +983,17 @@ Provide comparative analysis and insights based on the papers' content.
 
             if research_gaps.get('current_trends'):
                 story.append(Paragraph("Current Research Trends:", styles['Heading2']))
-                for trend in research_gaps['current_trends']:
-                    story.append(Paragraph(f"• {trend}", styles['Normal']))
+                story.append(self._bullet_paragraph(research_gaps['current_trends'], styles['Normal']))
                 story.append(Spacer(1, 12))
 
             if research_gaps.get('research_gaps'):
                 story.append(Paragraph("Identified Research Gaps:", styles['Heading2']))
-                for gap in research_gaps['research_gaps']:
-                    if isinstance(gap, dict):
-                        story.append(Paragraph(f"• {gap.get('gap', 'Unknown gap')}: {gap.get('description', 'No description')}", styles['Normal']))
-                    else:
-                        story.append(Paragraph(f"• {gap}", styles['Normal']))
+                gap_items = [
+                    f"{gap.get('gap', 'Unknown gap')}: {gap.get('description', 'No description')}"
+                    if isinstance(gap, dict) else gap
+                    for gap in research_gaps['research_gaps']
+                ]
+                story.append(self._bullet_paragraph(gap_items, styles['Normal']))
                 story.append(Spacer(1, 12))
 
             story.append(PageBreak())
@@ -737,35 +1005,29 @@ Provide comparative analysis and insights based on the papers' content.
 
                 if research_scope.get('research_objectives'):
                     story.append(Paragraph("Research Objectives:", styles['Heading2']))
-                    for obj in research_scope['research_objectives']:
-                        if isinstance(obj, dict):
-                            story.append(Paragraph(f"• {obj.get('objective', 'Unknown objective')}: {obj.get('description', 'No description')}", styles['Normal']))
-                        else:
-                            story.append(Paragraph(f"• {obj}", styles['Normal']))
+                    objective_items = [
+                        f"{obj.get('objective', 'Unknown objective')}: {obj.get('description', 'No description')}"
+                        if isinstance(obj, dict) else obj
+                        for obj in research_scope['research_objectives']
+                    ]
+                    story.append(self._bullet_paragraph(objective_items, styles['Normal']))
                     story.append(Spacer(1, 12))
 
             # Build PDF
             doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
 
         except Exception as e:
             logger.error(f"Error generating PDF report: {e}")
-            # Return a simple error PDF
-            buffer = BytesIO()
+            # Replace any partial output with a simple error PDF
+            buffer.seek(0)
+            buffer.truncate()
             try:
-                from reportlab.platypus import SimpleDocTemplate, Paragraph
-                from reportlab.lib.styles import getSampleStyleSheet
-                from reportlab.lib.pagesizes import A4
-
                 doc = SimpleDocTemplate(buffer, pagesize=A4)
-                styles = getSampleStyleSheet()
+                styles = self._styles
                 story = [
                     Paragraph("PDF Generation Error", styles['Title']),
                     Paragraph(f"Error: {str(e)}", styles['Normal'])
                 ]
                 doc.build(story)
-                buffer.seek(0)
-                return buffer.getvalue()
             except:
-                return b"PDF generation failed"
\ No newline at end of file
+                buffer.write(b"PDF generation failed")
\ No newline at end of file
@@ -1,9 +1,12 @@
 # app/services/paper_search/aggregator.py
 import asyncio
 import logging
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, FrozenSet, Optional, Set
 from collections import defaultdict
 import hashlib
+import math
+import re
+import time
 
 from app.models.paper import Paper, PaperSource, SortBy
 from app.services.paper_search.arxiv_search import ArxivSearcher
@@ -12,6 +15,81 @@ from app.services.paper_search.pubmed_search import PubMedSearcher
 
 logger = logging.getLogger(__name__)
 
+# Characters dropped when normalizing titles for comparison
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# Titles whose word sets have Jaccard similarity above this are treated as duplicates
+TITLE_SIMILARITY_THRESHOLD = 0.85
+
+class _TitleIndex:
+    """
+    Word sets of seen titles, indexed for near-duplicate lookup.
+
+    Uses prefix filtering: with each title's words in sorted order, two titles
+    whose Jaccard similarity reaches the threshold must share a word within their
+    first len - ceil(threshold * len) + 1 words. Only seen titles sharing such a
+    word are compared exactly, instead of every seen title.
+
+    Each seen title is stored as a bitmask over the index's vocabulary (one bit
+    per distinct word, so no collisions); the exact comparison is a popcount of
+    the AND of two ints rather than building intersection and union sets.
+    """
+
+    def __init__(self, threshold: float = TITLE_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._word_bits: Dict[str, int] = {}
+        self._masks: List[int] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def _prefix(self, words: FrozenSet[str]) -> List[str]:
+        tokens = sorted(words)
+        return tokens[:len(tokens) - math.ceil(self.threshold * len(tokens)) + 1]
+
+    def has_similar(self, words: FrozenSet[str]) -> bool:
+        """Whether a seen title's Jaccard similarity with these words exceeds the threshold"""
+        if not words:
+            return False
+
+        # Words outside the vocabulary can't be shared with a seen title, so they get no bit
+        mask = 0
+        for word in words:
+            bit = self._word_bits.get(word)
+            if bit is not None:
+                mask |= bit
+        size = len(words)
+
+        checked: Set[int] = set()
+        for token in self._prefix(words):
+            for index in self._postings.get(token, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                seen_size = self._sizes[index]
+                # Jaccard can't exceed the size ratio, so skip the popcount when that's too small
+                if min(size, seen_size) / max(size, seen_size) <= self.threshold:
+                    continue
+                shared = (mask & self._masks[index]).bit_count()
+                if shared / (size + seen_size - shared) > self.threshold:
+                    return True
+        return False
+
+    def add(self, words: FrozenSet[str]):
+        """Index a kept title"""
+        if not words:
+            return
+        mask = 0
+        for word in words:
+            bit = self._word_bits.get(word)
+            if bit is None:
+                bit = self._word_bits[word] = 1 << len(self._word_bits)
+            mask |= bit
+        index = len(self._masks)
+        self._masks.append(mask)
+        self._sizes.append(len(words))
+        for token in self._prefix(words):
+            self._postings[token].append(index)
+
 class PaperSearchAggregator:
     """Aggregates search results from multiple paper sources"""
 
@@ -23,6 +101,13 @@ class PaperSearchAggregator:
             # IEEE removed - not implementing for now
         }
 
+    async def close(self):
+        """Release HTTP sessions held by the searchers"""
+        for searcher in self.sources.values():
+            close = getattr(searcher, "close", None)
+            if close is not None:
+                await close()
+
     async def search_all_sources(
         self,
         query: str,
@@ -62,8 +147,11 @@ class PaperSearchAggregator:
                 return []
 
             # Execute all searches concurrently
+            # Sources are issued together, so latency tracks the slowest source
             logger.info(f"Executing {len(tasks)} search tasks concurrently")
+            started = time.perf_counter()
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            logger.debug(f"Searched {len(tasks)} sources in {time.perf_counter() - started:.2f}s")
 
             # Process results
             all_papers = []
@@ -123,7 +211,7 @@ class PaperSearchAggregator:
             return []
 
         seen_dois: Set[str] = set()
-        seen_titles: Set[str] = set()
+        seen_titles = _TitleIndex()
         unique_papers: List[Paper] = []
 
         for paper in papers:
@@ -133,10 +221,10 @@ class PaperSearchAggregator:
                 continue
 
             # Create a normalized title for comparison
-            normalized_title = self._normalize_title(paper.title)
+            title_words = frozenset(self._normalize_title(paper.title).split())
 
             # Skip if we've seen a very similar title
-            if self._is_similar_title(normalized_title, seen_titles):
+            if seen_titles.has_similar(title_words):
                 logger.debug(f"Skipping similar title: {paper.title[:50]}...")
                 continue
 
@@ -146,7 +234,7 @@ class PaperSearchAggregator:
             if paper.doi:
                 seen_dois.add(paper.doi)
 
-            seen_titles.add(normalized_title)
+            seen_titles.add(title_words)
 
         logger.info(f"Deduplicated {len(papers)} papers to {len(unique_papers)} unique papers")
         return unique_papers
@@ -159,46 +247,13 @@ class PaperSearchAggregator:
             return ""
 
         # Convert to lowercase and remove special characters
-        import re
-        normalized = re.sub(r'[^\w\s]', '', title.lower())
+        normalized = _NON_WORD_RE.sub('', title.lower())
 
         # Remove extra whitespace
         normalized = ' '.join(normalized.split())
 
         return normalized
 
-    def _is_similar_title(self, title: str, seen_titles: Set[str]) -> bool:
-        """
-        Check if title is similar to any seen titles
-        """
-        if not title:
-            return False
-
-        for seen_title in seen_titles:
-            if self._calculate_title_similarity(title, seen_title) > 0.85:
-                return True
-
-        return False
-
-    def _calculate_title_similarity(self, title1: str, title2: str) -> float:
-        """
-        Calculate similarity between two titles using simple ratio
-        """
-        if not title1 or not title2:
-            return 0.0
-
-        # Simple similarity based on common words
-        words1 = set(title1.split())
-        words2 = set(title2.split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-
-        return len(intersection) / len(union)
-
     def _sort_papers(self, papers: List[Paper], sort_by: SortBy) -> List[Paper]:
         """
         Sort papers based on the specified criteria
@@ -6,11 +6,16 @@ from datetime import datetime, timedelta
 import hashlib
 import os
 import json
+import re
 from app.core.config import settings
 from app.models.paper import Paper, PaperSource
 
 logger = logging.getLogger(__name__)
 
+_YEAR_RE = re.compile(r'\b(20\d{2}|19\d{2})\b')
+_DOI_ORG_RE = re.compile(r'doi\.org/(.+)')
+_DOI_PARAM_RE = re.compile(r'doi[=/]([^&\s]+)', re.IGNORECASE)
+
 # Import SERP API
 try:
     from serpapi import GoogleSearch
@@ -254,8 +259,7 @@ class GoogleScholarSearcher:
         summary = publication_info.get("summary", "")
 
         # Look for year pattern in summary (e.g., "2023", "2022")
-        import re
-        year_match = re.search(r'\b(20\d{2}|19\d{2})\b', summary)
+        year_match = _YEAR_RE.search(summary)
 
         if year_match:
             year = year_match.group(1)
@@ -271,13 +275,12 @@ class GoogleScholarSearcher:
             return None
 
         # Check if link contains DOI pattern
-        import re
-        doi_match = re.search(r'doi\.org/(.+)', link)
+        doi_match = _DOI_ORG_RE.search(link)
         if doi_match:
             return doi_match.group(1)
 
         # Check for DOI in the URL parameters
-        doi_match = re.search(r'doi[=/]([^&\s]+)', link, re.IGNORECASE)
+        doi_match = _DOI_PARAM_RE.search(link)
         if doi_match:
             return doi_match.group(1)
 
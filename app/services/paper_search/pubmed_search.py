@@ -19,6 +19,19 @@ class PubMedSearcher:
         self.search_url = f"{self.base_url}esearch.fcgi"
         self.fetch_url = f"{self.base_url}efetch.fcgi"
         self.summary_url = f"{self.base_url}esummary.fcgi"
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def search(self, query: str, max_results: int = 10, date_range: Optional[Dict] = None) -> List[Paper]:
         """Search PubMed for papers"""
@@ -61,15 +74,15 @@ class PubMedSearcher:
                 params["term"] = f"({query}) AND {date_filter}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.search_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        pmids = data.get("esearchresult", {}).get("idlist", [])
-                        return pmids
-                    else:
-                        logger.error(f"PubMed search failed with status: {response.status}")
-                        return []
+            session = self._get_session()
+            async with session.get(self.search_url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    pmids = data.get("esearchresult", {}).get("idlist", [])
+                    return pmids
+                else:
+                    logger.error(f"PubMed search failed with status: {response.status}")
+                    return []
 
         except Exception as e:
             logger.error(f"Error searching PMIDs: {e}")
@@ -109,19 +122,19 @@ class PubMedSearcher:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                # Fetch paper details
-                async with session.get(self.fetch_url, params=params) as response:
-                    if response.status == 200:
-                        xml_content = await response.text()
-                        papers = self._parse_pubmed_xml(xml_content)
+            session = self._get_session()
+            # Fetch paper details
+            async with session.get(self.fetch_url, params=params) as response:
+                if response.status == 200:
+                    xml_content = await response.text()
+                    papers = self._parse_pubmed_xml(xml_content)
                         
-                        # Check for PMC full-text availability
-                        await self._check_pmc_availability(papers, pmids, session)
-                        return papers
-                    else:
-                        logger.error(f"PubMed fetch failed with status: {response.status}")
-                        return []
+                    # Check for PMC full-text availability
+                    await self._check_pmc_availability(papers, pmids, session)
+                    return papers
+                else:
+                    logger.error(f"PubMed fetch failed with status: {response.status}")
+                    return []
 
         except Exception as e:
             logger.error(f"Error fetching PubMed details: {e}")
@@ -5,6 +5,7 @@ from typing import List, Dict, Optional, Any
 from datetime import datetime
 import json
 import os
+from app.core.config import settings
 from app.models.search import SearchSession, SearchStatus, PaperSearchRequest
 from app.models.paper import Paper, PaperAnalysis, PaperWithAnalysis, PaperSource, SortBy
 from app.models.chat import ChatMessage, MessageRole
@@ -62,7 +63,8 @@ class MockFirestoreSessionManager:
 
             serialized_data = safe_serialize(data)
             with open(file_path, 'w') as f:
-                json.dump(serialized_data, f, indent=2)
+                # Pretty-print only in development; compact output is faster to write and re-read
+                json.dump(serialized_data, f, indent=2 if settings.is_development else None)
         except Exception as e:
             logger.error(f"Error saving {file_path}: {e}")
             raise
@@ -215,6 +217,7 @@ class MockFirestoreSessionManager:
 
             session_key = f"{user_id}_{session_id}"
             papers_data[session_key] = []
+            stored_at = datetime.utcnow().isoformat()  # One timestamp for the whole batch
 
             for paper_with_analysis in papers:
                 paper = paper_with_analysis.paper
@@ -256,7 +259,7 @@ class MockFirestoreSessionManager:
                         'main_findings': [str(m) for m in analysis.main_findings],
                         'generated_at': analysis.generated_at.isoformat()
                     } if analysis else None,
-                    'stored_at': datetime.utcnow().isoformat()
+                    'stored_at': stored_at
                 }
 
                 papers_data[session_key].append(paper_entry)